@@ -1,8 +1,17 @@
+import argparse
 import json
+import os
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-import feedparser
+from feed_fetcher import FETCH_WORKERS, fetch_feed
+from channel_journal import CHANNELS_FILE, ChannelJournal
+from parse_pool import PROCESS_PARSE_THRESHOLD, ParsePool
 
-# Seznam UC ID kanálů
+# Výchozí seznam UC ID kanálů (bez souboru a stdin)
 channel_ids = [
     "UCUkRj4qoT1bsWpE_C8lZYoQ",
     "UCajiMK_CY9icRhLepS8_3ug",
@@ -29,19 +38,136 @@ channel_ids = [
     "UCSPIuWADJIMIf9Erf--XAsA",
 ]
 
-# Slovník pro výstup
-channels_dict = {}
+# Průběh řešení: jeden řádek JSON na kanál, opakované spuštění vyřešené ID přeskočí
+CHECKPOINT_FILE = "resolve_checkpoint.jsonl"
 
-for cid in channel_ids:
-    feed_url = f"https://www.youtube.com/feeds/videos.xml?channel_id={cid}"
-    feed = feedparser.parse(feed_url)
+REQUESTS_PER_SECOND = 20
+UNKNOWN_CHANNEL = "Neznámý kanál"
 
-    channel_title = feed.feed.title if "title" in feed.feed else "Neznámý kanál"
-    channels_dict[channel_title] = cid
 
-# Vytiskne ve formátu JSON / Python slovník
-print(json.dumps(channels_dict, indent=4, ensure_ascii=False))
+class RateLimiter:
+    """Rovnoměrné rozložení požadavků: nejvýše rate za sekundu ze všech vláken"""
 
-# Volitelně ulož do souboru
-with open("youtube_channels.json", "w", encoding="utf-8") as f:
-    json.dump(channels_dict, f, indent=4, ensure_ascii=False)
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self.next_slot = time.monotonic()
+        self.lock = threading.Lock()
+
+    def wait(self):
+        with self.lock:
+            now = time.monotonic()
+            slot = max(self.next_slot, now)
+            self.next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def read_ids(path):
+    """UC ID ze souboru nebo stdin ("-"), jedno nebo více na řádek; duplicity se vynechají"""
+    if path is None:
+        text = "\n".join(channel_ids)
+    elif path == "-":
+        text = sys.stdin.read()
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            text = f.read()
+    ids = dict.fromkeys(re.findall(r"(?<![\w-])UC[\w-]{22}(?![\w-])", text))
+    return list(ids)
+
+
+def load_checkpoint(path):
+    """Už vyřešené kanály: channel_id -> název (None = kanál neexistuje)"""
+    done = {}
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # neúplný poslední řádek po přerušení
+                done[record["id"]] = record["title"]
+    return done
+
+
+def resolve(channel_id, limiter, parse_pool=None):
+    """Název kanálu z jeho feedu; None pro neexistující kanál, výjimka při chybě sítě"""
+    limiter.wait()
+    feed = fetch_feed(channel_id, parse_pool=parse_pool)
+    if feed.get("status") == 404:
+        return None
+    if feed.get("status") != 200:
+        raise RuntimeError(feed.get("bozo_exception") or f"HTTP {feed.get('status')}")
+    return feed.feed.get("title") or UNKNOWN_CHANNEL
+
+
+def merge_channels(path, resolved):
+    """Sloučení do seznamu kanálů; stejný název jiného kanálu dostane příponu s ID"""
+    journal = ChannelJournal(path)
+    channels = journal.load()
+    known = set(channels.values())
+    added = {}
+    for channel_id, title in resolved.items():
+        if title is None or channel_id in known:
+            continue
+        name = title
+        if name in channels:
+            name = f"{title} ({channel_id})"
+        channels[name] = channel_id
+        journal.add(name, channel_id)
+        added[name] = channel_id
+        known.add(channel_id)
+    journal.close()
+    return added
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hromadné přidání kanálů podle UC ID")
+    parser.add_argument("ids", nargs="?", help='soubor s UC ID, "-" pro stdin (výchozí: vestavěný seznam)')
+    parser.add_argument("--output", default=CHANNELS_FILE, help="soubor kanálů, do kterého se výsledky sloučí")
+    parser.add_argument("--checkpoint", default=CHECKPOINT_FILE)
+    parser.add_argument("--workers", type=int, default=FETCH_WORKERS)
+    parser.add_argument("--rate", type=float, default=REQUESTS_PER_SECOND, help="max. požadavků za sekundu")
+    parser.add_argument("--parse-threshold", type=int, default=PROCESS_PARSE_THRESHOLD,
+                        help="od kolika kanálů parsovat feedy v procesech")
+    args = parser.parse_args()
+
+    ids = read_ids(args.ids)
+    done = load_checkpoint(args.checkpoint)
+    todo = [cid for cid in ids if cid not in done]
+    print(f"Kanálů: {len(ids)}, hotovo z minula: {len(ids) - len(todo)}, zbývá: {len(todo)}", file=sys.stderr)
+
+    limiter = RateLimiter(args.rate)
+    # Velké seznamy se parsují v procesech, ne ve vláknech stahování
+    parse_pool = ParsePool() if len(todo) >= args.parse_threshold else None
+    failed = 0
+    with open(args.checkpoint, "a", encoding="utf-8") as checkpoint, \
+            ThreadPoolExecutor(max_workers=args.workers) as executor:
+        futures = {executor.submit(resolve, cid, limiter, parse_pool): cid for cid in todo}
+        try:
+            for count, future in enumerate(as_completed(futures), 1):
+                cid = futures[future]
+                try:
+                    title = future.result()
+                except Exception as e:
+                    print(f"Chyba při načítání kanálu {cid}: {e}", file=sys.stderr)
+                    failed += 1
+                    continue
+                done[cid] = title
+                checkpoint.write(json.dumps({"id": cid, "title": title}, ensure_ascii=False) + "\n")
+                checkpoint.flush()
+                if count % 100 == 0:
+                    print(f"{count}/{len(todo)}", file=sys.stderr)
+        except KeyboardInterrupt:
+            executor.shutdown(wait=False, cancel_futures=True)
+            print("Přerušeno, další spuštění naváže.", file=sys.stderr)
+    if parse_pool is not None:
+        parse_pool.shutdown()
+
+    added = merge_channels(args.output, {cid: done[cid] for cid in ids if cid in done})
+    missing = sum(1 for cid in ids if cid in done and done[cid] is None)
+    print(json.dumps(added, indent=4, ensure_ascii=False))
+    print(f"Přidáno: {len(added)}, neexistuje: {missing}, chyba (zopakuje se): {failed}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
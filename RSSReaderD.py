@@ -1,26 +1,54 @@
 #!/usr/bin/env python3
 import sys
-import re
-import json
-import os
-import requests
-import feedparser
-import webbrowser
-import urllib3
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QHBoxLayout, QVBoxLayout,
-    QPushButton, QListWidget, QLabel, QInputDialog, QMessageBox, QSizePolicy, QScrollArea
+    QPushButton, QLabel, QLineEdit, QInputDialog, QMessageBox, QSizePolicy, QScrollArea, QShortcut
 )
-from PyQt5.QtGui import QPixmap, QFont
-from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QPixmap, QFont, QKeySequence
+from PyQt5.QtCore import Qt, QTimer, pyqtSignal
 
-CHANNELS_FILE = "RSS_channels.json"
+import http_client
+from channel_health import OK
+from channel_resolver import channel_refs
+from feed_fetcher import FETCH_WORKERS
+from instrumentation import timed
+from list_models import ChannelListModel, ListView, VideoListModel
+from reader_core import ReaderCore
+from thumbnail_cache import ThumbnailCache
+from thumbnail_loader import PREFETCH_FIRST, PREFETCH_NEIGHBOURS, ThumbnailError, ThumbnailLoader
+from timeline import ALL_CHANNELS
+
+# Virtuální "kanál" s výsledky fulltextového hledání
+SEARCH_RESULTS = "Výsledky hledání"
+
+# Bez ověřování SSL (warning potlačí http_client při vytvoření session)
+http_client.client.verify = False
+
+
+def download_thumbnail(url):
+    """Stažení náhledu (volá se z pracovního vlákna ThumbnailLoader)"""
+    response = http_client.get(url)
+    if response.status_code != 200:
+        raise ThumbnailError(f"Chyba načtení thumbnailu ({response.status_code}).")
+    return response.content
+
+
+def thumbnail_url(video):
+    """URL náhledu videa"""
+    if video.thumbnail:
+        return video.thumbnail.replace('&amp;', '&')
+    # Fallback na oficiální YouTube thumbnail podle video_id
+    if video.video_id:
+        return f"https://img.youtube.com/vi/{video.video_id}/hqdefault.jpg"
+    return None
 
-# Potlačení warningu při ověřování SSL, pokud verify=False
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
 class YoutubeRssReader(QWidget):
-    def __init__(self):
+    # Výsledek stažení feedu z pracovního vlákna (název, ID, feed nebo None)
+    feed_loaded = pyqtSignal(str, str, object)
+    channel_fetched = pyqtSignal(object, str, object, object)
+
+    def __init__(self, fetch_workers=FETCH_WORKERS):
         super().__init__()
         self.setWindowTitle("YouTube RSS channels reader")
         self.setGeometry(100, 100, 1200, 800)
@@ -29,7 +57,8 @@ class YoutubeRssReader(QWidget):
         # Levý panel (kanály)
         left_panel = QVBoxLayout()
         main_layout.addLayout(left_panel, 2)
-        self.channel_list = QListWidget()
+        self.channel_model = ChannelListModel([ALL_CHANNELS])
+        self.channel_list = ListView(self.channel_model)
         self.channel_list.setFixedHeight(650)
         left_panel.addWidget(QLabel("Kanály:"))
         left_panel.addWidget(self.channel_list)
@@ -37,11 +66,18 @@ class YoutubeRssReader(QWidget):
         left_panel.addWidget(self.add_channel_btn)
         self.remove_channel_btn = QPushButton("Odebrat vybraný kanál")
         left_panel.addWidget(self.remove_channel_btn)
+        self.next_unread_btn = QPushButton("Další nezhlédnuté (N)")
+        left_panel.addWidget(self.next_unread_btn)
         # Pravý panel (videa a detaily)
         right_panel = QVBoxLayout()
         main_layout.addLayout(right_panel, 5)
+        self.search_box = QLineEdit()
+        self.search_box.setPlaceholderText("Hledat ve všech kanálech...")
+        self.search_box.setClearButtonEnabled(True)
+        right_panel.addWidget(self.search_box)
         right_panel.addWidget(QLabel("Videa:"))
-        self.video_list = QListWidget()
+        self.video_model = VideoListModel()
+        self.video_list = ListView(self.video_model)
         self.video_list.setFixedHeight(200)
         right_panel.addWidget(self.video_list)
         self.thumbnail_label = QLabel()
@@ -56,16 +92,32 @@ class YoutubeRssReader(QWidget):
         self.description_scroll_area.setWidget(self.description_label)
         self.description_scroll_area.setWidgetResizable(True)
         right_panel.addWidget(self.description_scroll_area, 1)
-        self.channels = {}
         self.current_channel = None
+        self.search_names = []
+        self.search_videos = []
         # Signály
         self.add_channel_btn.clicked.connect(self.add_channel)
         self.remove_channel_btn.clicked.connect(self.remove_channel)
         self.channel_list.currentRowChanged.connect(self.channel_changed)
+        self.search_box.textChanged.connect(self.search_changed)
         self.video_list.currentRowChanged.connect(self.video_selected)
-        self.video_list.itemDoubleClicked.connect(self.open_video)
+        self.video_list.doubleClicked.connect(self.open_video)
+        self.feed_loaded.connect(self.on_feed_loaded)
+        self.channel_fetched.connect(self.on_channel_fetched)
+        self.debug_panel = None
+        QShortcut(QKeySequence("F12"), self, self.show_debug_panel)
+        self.next_unread_btn.clicked.connect(self.next_unread)
+        QShortcut(QKeySequence("N"), self, self.next_unread)
+        self.core = ReaderCore(self.feed_loaded.emit, fetch_workers)
+        self.video_model.is_watched = self.core.watch.is_watched
+        self.thumbnails = ThumbnailCache()
+        self.thumbnail_loader = ThumbnailLoader(self.thumbnails, download_thumbnail)
+        self.thumbnail_loader.loaded.connect(self.on_thumbnail_loaded)
+        self.thumbnail_loader.prefetched.connect(self.on_thumbnail_prefetched)
         # Načti uložené kanály
         self.load_channels()
+        # Síť až po prvním vykreslení okna
+        QTimer.singleShot(0, self.start_refresh)
         self.set_font()
 
     def set_font(self):
@@ -77,178 +129,261 @@ class YoutubeRssReader(QWidget):
         self.description_label.setFont(font)
 
     def add_channel(self):
-        channel_id, ok = QInputDialog.getText(self, "Zadej channel ID-UC kanal!", "UC kanál ID example (UCxxxxxxxx):")
-        if not ok or not channel_id.startswith("UC") or not re.match(r"^UC[\w-]+$", channel_id):
-            QMessageBox.warning(self, "Chyba", "Neplatné channel ID, kanál nebude přidán. Ujistěte se, že ID začíná na 'UC' a má správný formát.")
+        text, ok = QInputDialog.getMultiLineText(
+            self, "Přidat kanály", "UC ID, URL kanálu nebo @handle (více kanálů na samostatných řádcích):"
+        )
+        if not ok or not text.strip():
             return
-        rss_url = f"https://www.youtube.com/feeds/videos.xml?channel_id={channel_id}"
-        feed = feedparser.parse(rss_url)
-        if not feed.entries:
-            QMessageBox.warning(self, "Chyba", "Nepodařilo se načíst videa z tohoto kanálu.")
+        # Na pozadí, kanály se přidávají postupně v on_channel_fetched
+        refs = channel_refs(text)
+        batch = {"refs": refs, "left": len(refs), "added": [], "failed": []}
+        self.core.add_channels(
+            refs, lambda ref, channel_id, feed: self.channel_fetched.emit(batch, ref, channel_id, feed)
+        )
+
+    def on_channel_fetched(self, batch, ref, channel_id, feed):
+        channel_title = self.core.add_fetched(channel_id, feed)
+        if channel_title is None:
+            batch["failed"].append(ref)
+        else:
+            self.channel_model.add(channel_title)
+            self.channel_model.set_state(channel_title, OK)
+            self.update_unread(channel_title)
+            batch["added"].append(channel_title)
+            if self.current_channel == ALL_CHANNELS:
+                self.reload_current_videos()
+        batch["left"] -= 1
+        if batch["left"]:
             return
-        channel_title = feed.feed.get("title", channel_id)
-        self.channels[channel_title] = {"id": channel_id, "entries": feed.entries}
-        existing_channels = [self.channel_list.item(i).text() for i in range(self.channel_list.count())]
-        if channel_title not in existing_channels:
-            self.channel_list.addItem(channel_title)
-        idx = self.channel_list.findItems(channel_title, Qt.MatchExactly)[0]
-        self.channel_list.setCurrentItem(idx)
-        self.save_channels()
+        if batch["added"]:
+            self.channel_list.setCurrentRow(self.channel_model.row(batch["added"][-1]))
+        failed = [ref for ref in batch["refs"] if ref in batch["failed"]]
+        if failed:
+            QMessageBox.warning(self, "Chyba", "Nepodařilo se načíst videa z těchto kanálů:\n" + "\n".join(failed))
 
     def remove_channel(self):
         current_row = self.channel_list.currentRow()
         if current_row < 0:
             QMessageBox.information(self, "Odebrat kanál", "Nejprve vyber kanál k odebrání.")
             return
-        channel_name = self.channel_list.item(current_row).text()
+        channel_name = self.channel_model.name(current_row)
+        if channel_name == ALL_CHANNELS:
+            QMessageBox.information(self, "Odebrat kanál", "Nejprve vyber kanál k odebrání.")
+            return
         confirm = QMessageBox.question(
             self, "Potvrzení odebrání",
             f"Opravdu chceš odebrat kanál:\n{channel_name}?",
             QMessageBox.Yes | QMessageBox.No
         )
         if confirm == QMessageBox.Yes:
-            if channel_name in self.channels:
-                del self.channels[channel_name]
-            self.channel_list.takeItem(current_row)
-            self.video_list.clear()
+            self.core.remove_channel(channel_name)
+            self.channel_model.remove(channel_name)
+            self.update_unread(ALL_CHANNELS)
+            self.video_model.clear()
             self.thumbnail_label.clear()
             self.description_label.setText("Vyberte video pro zobrazení podrobností.")
             self.current_channel = None
-            self.save_channels()
 
     def channel_changed(self, index):
         if index < 0:
             return
-        channel_name = self.channel_list.item(index).text()
+        channel_name = self.channel_model.name(index)
         self.current_channel = channel_name
+        self.search_box.blockSignals(True)
+        self.search_box.clear()
+        self.search_box.blockSignals(False)
         self.load_videos_for_channel(channel_name)
 
+    def search_changed(self, text):
+        if not text.strip():
+            # Po smazání dotazu se vrátí seznam vybraného kanálu
+            if self.current_channel == SEARCH_RESULTS:
+                self.current_channel = None
+                self.video_model.clear()
+                self.channel_changed(self.channel_list.currentRow())
+            return
+        self.search_names, self.search_videos = self.core.search(text)
+        self.current_channel = SEARCH_RESULTS
+        self.load_videos_for_channel(SEARCH_RESULTS)
+
     def load_videos_for_channel(self, channel_name):
-        self.video_list.clear()
+        self.thumbnail_loader.cancel()
         self.thumbnail_label.clear()
         self.description_label.setText("Vyberte video pro zobrazení podrobností.")
-        entries = self.channels[channel_name]["entries"]
-        for entry in entries:
-            self.video_list.addItem(entry.title)
+        entries = self.channel_entries(channel_name)
+        with timed("video_list_render"):
+            if channel_name == ALL_CHANNELS:
+                # Kopie, osa se při obnově mění na místě
+                self.video_model.set_videos(list(entries), list(self.core.timeline.names))
+            elif channel_name == SEARCH_RESULTS:
+                self.video_model.set_videos(entries, self.search_names)
+            else:
+                self.video_model.set_videos(entries)
+        self.thumbnail_loader.cancel_prefetch()
+        self.prefetch_thumbnails(range(PREFETCH_FIRST))
+
+    def prefetch_thumbnails(self, rows):
+        entries = self.channel_entries(self.current_channel)
+        size = (self.thumbnail_label.width(), self.thumbnail_label.height())
+        keys = []
+        for row in rows:
+            if 0 <= row < len(entries):
+                url = thumbnail_url(entries[row])
+                if url and (url, *size) not in self.thumbnails.memory.items:
+                    keys.append((url, *size))
+        self.thumbnail_loader.prefetch(keys)
 
     def video_selected(self, index):
         if index < 0 or self.current_channel is None:
+            self.thumbnail_loader.cancel()
             self.thumbnail_label.clear()
             self.description_label.setText("Vyberte video pro zobrazení podrobností.")
             return
-        entries = self.channels[self.current_channel]["entries"]
+        entries = self.channel_entries(self.current_channel)
         if index >= len(entries):
             return
         video = entries[index]
-        title = video.get("title", "Bez názvu")
-        published = video.get("published", "")
-        summary = video.get("summary", "")
+        title = video.title or "Bez názvu"
+        published = video.published
+        summary = video.summary
         self.description_label.setText(f"<b>{title}</b>\n{published}\n\n{summary}")
 
-        thumbnail_url = None
-        if "media_thumbnail" in video and video.media_thumbnail:
-            thumbnail_url = video.media_thumbnail[0]["url"].replace('&amp;', '&')
-        elif "media_content" in video and video.media_content:
-            thumbnail_url = video.media_content[0]["url"].replace('&amp;', '&')
-        else:
-            # Fallback na oficiální YouTube thumbnail podle video_id
-            video_id_match = re.search(r'v=([\w-]+)', video.link)
-            if not video_id_match:
-                video_id_match = re.search(r'(?:/videos/|/embed/|/shorts/)([a-zA-Z0-9_-]+)', video.link)
-            if video_id_match:
-                video_id = video_id_match.group(1)
-                thumbnail_url = f"https://img.youtube.com/vi/{video_id}/hqdefault.jpg"
-
-        if thumbnail_url:
-            try:
-                headers = {
-                    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                                  "AppleWebKit/537.36 (KHTML, like Gecko) "
-                                  "Chrome/120.0.0.0 Safari/537.36"
-                }
-                response = requests.get(thumbnail_url, timeout=10, headers=headers, verify=False)
-                if response.status_code == 200:
-                    image = QPixmap()
-                    ok = image.loadFromData(response.content)
-                    if ok:
-                        scaled = image.scaled(self.thumbnail_label.width(), self.thumbnail_label.height(), Qt.KeepAspectRatio, Qt.SmoothTransformation)
-                        self.thumbnail_label.setPixmap(scaled)
-                    else:
-                        self.thumbnail_label.setText("Nelze načíst obrázek.")
-                else:
-                    self.thumbnail_label.setText(f"Chyba načtení thumbnailu ({response.status_code}).")
-            except Exception as e:
-                self.thumbnail_label.setText(f"Chyba obrázku: {e}")
+        self.prefetch_thumbnails(range(index - PREFETCH_NEIGHBOURS, index + PREFETCH_NEIGHBOURS + 1))
+
+        url = thumbnail_url(video)
+        if url:
+            key = (url, self.thumbnail_label.width(), self.thumbnail_label.height())
+            cached = self.thumbnails.memory.get(key)
+            if cached is not None:
+                self.thumbnail_loader.cancel()
+                self.thumbnail_label.setPixmap(cached)
+                return
+            self.thumbnail_label.setText("Načítání náhledu...")
+            self.thumbnail_loader.request(*key)
         else:
+            self.thumbnail_loader.cancel()
             self.thumbnail_label.setText("Náhled není dostupný.")
 
-    def open_video(self, item):
+    def on_thumbnail_prefetched(self, generation, key, image):
+        if generation == self.thumbnail_loader.prefetch_generation:
+            with timed("thumbnail_pixmap"):
+                pixmap = QPixmap.fromImage(image)
+            self.thumbnails.memory.put(key, pixmap)
+
+    def on_thumbnail_loaded(self, generation, key, image, error):
+        if not self.thumbnail_loader.is_current(generation):
+            return
+        if image is None:
+            self.thumbnail_label.setText(error)
+            return
+        with timed("thumbnail_pixmap"):
+            pixmap = QPixmap.fromImage(image)
+        self.thumbnails.memory.put(key, pixmap)
+        self.thumbnail_label.setPixmap(pixmap)
+
+    def open_video(self, model_index):
         index = self.video_list.currentRow()
         if self.current_channel is None or index < 0:
             return
-        entries = self.channels[self.current_channel]["entries"]
+        entries = self.channel_entries(self.current_channel)
         video = entries[index]
+        self.mark_watched(index, video)
+        import webbrowser
+
         webbrowser.open(video.link)
 
     def on_thumbnail_click(self, event):
         index = self.video_list.currentRow()
         if self.current_channel is None or index < 0:
             return
-        entries = self.channels[self.current_channel]["entries"]
+        entries = self.channel_entries(self.current_channel)
         video = entries[index]
+        self.mark_watched(index, video)
+        import webbrowser
+
         webbrowser.open(video.link)
 
-    def extract_channel_id(self, url):
-        try:
-            if not url.endswith("/about"):
-                if url.endswith("/"):
-                    url += "about"
-                else:
-                    url += "/about"
-            headers = {"User-Agent": "Mozilla/5.0"}
-            response = requests.get(url, headers=headers, verify=False)
-            html = response.text
-            match = re.search(r'<link rel="canonical" href="https://www\.youtube\.com/channel/(UC[\w-]+)"', html)
-            if match:
-                return match.group(1)
-            match2 = re.search(r'<meta\s+itemprop="channelId"\s+content="(UC[\w-]+)"', html)
-            if match2:
-                return match2.group(1)
-            match3 = re.search(r'<meta\s+property="og:url"\s+content="https://www\.youtube\.com/channel/(UC[\w-]+)"', html)
-            if match3:
-                return match3.group(1)
-            scripts = re.findall(r'<script[^>]*>(.*?)</script>', html, flags=re.DOTALL)
-            for script in scripts:
-                if 'channelId' in script:
-                    json_matches = re.findall(r'("channelId":"(UC[\w-]+)")', script)
-                    if json_matches:
-                        return json_matches[0][1]
-            return None
-        except Exception as e:
-            print(f"Chyba při získávání channel_id:", e)
-            return None
-
-    def save_channels(self):
-        try:
-            data_to_save = {name: info["id"] for name, info in self.channels.items()}
-            with open(CHANNELS_FILE, "w", encoding="utf-8") as f:
-                json.dump(data_to_save, f, ensure_ascii=False, indent=4)
-        except Exception as e:
-            print(f"Chyba při ukládání kanálů: {e}")
+    def mark_watched(self, row, video):
+        names = self.video_model.names
+        channel_name = names[row] if names is not None else self.current_channel
+        if self.core.mark_watched(channel_name, video):
+            self.video_model.video_changed(row)
+            self.update_unread(channel_name)
+
+    def update_unread(self, channel_name):
+        self.channel_model.set_unread(channel_name, self.core.unread_count(channel_name))
+        self.channel_model.set_unread(ALL_CHANNELS, self.core.unread_count(ALL_CHANNELS))
+
+    def next_unread(self):
+        if self.current_channel == SEARCH_RESULTS:
+            self.search_box.clear()
+        if self.current_channel is not None:
+            row = self.core.next_unread(self.current_channel, self.video_list.currentRow() + 1)
+            if row >= 0:
+                self.video_list.setCurrentRow(row)
+                return
+        channel_name = self.core.next_unread_channel(self.channel_model.names, self.current_channel)
+        if channel_name is None:
+            return
+        self.channel_list.setCurrentRow(self.channel_model.row(channel_name))
+        self.video_list.setCurrentRow(self.core.next_unread(channel_name))
 
     def load_channels(self):
-        try:
-            if os.path.exists(CHANNELS_FILE):
-                with open(CHANNELS_FILE, "r", encoding="utf-8") as f:
-                    saved_channels = json.load(f)
-                for channel_name, channel_id in saved_channels.items():
-                    rss_url = f"https://www.youtube.com/feeds/videos.xml?channel_id={channel_id}"
-                    feed = feedparser.parse(rss_url)
-                    if feed.entries:
-                        self.channels[channel_name] = {"id": channel_id, "entries": feed.entries}
-                        self.channel_list.addItem(channel_name)
-        except Exception as e:
-            print(f"Chyba při načítání kanálů: {e}")
+        # Okamžité zobrazení z lokálního úložiště, aktualizace ze sítě běží na pozadí
+        self.core.load_channels()
+        names = [*self.core.channels, *self.core.failed_channels()]
+        self.channel_model.set_names([ALL_CHANNELS, *names])
+        for channel_name in names:
+            self.channel_model.set_state(channel_name, *self.core.channel_state(channel_name))
+        for channel_name in [ALL_CHANNELS, *names]:
+            self.channel_model.set_unread(channel_name, self.core.unread_count(channel_name))
+
+    def start_refresh(self):
+        self.core.refresh_all()
+        self.core.start()
+
+    def on_feed_loaded(self, channel_name, channel_id, feed):
+        changed = self.core.apply_feed(channel_name, channel_id, feed)
+        state, message = self.core.channel_state(channel_name)
+        if changed is None:
+            if state != OK:
+                self.channel_model.add(channel_name)
+                self.channel_model.set_state(channel_name, state, message)
+            return
+        self.channel_model.add(channel_name)
+        self.channel_model.set_state(channel_name, state, message)
+        self.update_unread(channel_name)
+        if changed and self.current_channel in (channel_name, ALL_CHANNELS):
+            self.reload_current_videos()
+
+    def channel_entries(self, channel_name):
+        if channel_name == SEARCH_RESULTS:
+            return self.search_videos
+        return self.core.channel_entries(channel_name)
+
+    def reload_current_videos(self):
+        row = self.video_list.currentRow()
+        selected = self.video_model.video(row).video_id if row >= 0 else None
+        self.video_list.blockSignals(True)
+        self.load_videos_for_channel(self.current_channel)
+        self.video_list.blockSignals(False)
+        if selected is not None:
+            row = self.video_model.row(selected)
+            if row >= 0:
+                self.video_list.setCurrentRow(row)
+
+    def show_debug_panel(self):
+        if self.debug_panel is None:
+            from debug_panel import DebugPanel
+
+            self.debug_panel = DebugPanel(self.core.subscriptions, self)
+        self.debug_panel.show()
+        self.debug_panel.raise_()
+
+    def closeEvent(self, event):
+        self.core.shutdown()
+        self.thumbnail_loader.shutdown()
+        super().closeEvent(event)
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
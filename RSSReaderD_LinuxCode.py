@@ -2,25 +2,46 @@
 # pip install opencv-python --upgrade
 # export QT_QPA_PLATFORM=wayland example for linux
 import sys
-import re
-import json
-import os
-import requests
-import feedparser
-import webbrowser
-import urllib3
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QHBoxLayout, QVBoxLayout,
-    QPushButton, QListWidget, QLabel, QLineEdit, QInputDialog, QMessageBox, QSizePolicy, QScrollArea
+    QPushButton, QLabel, QLineEdit, QInputDialog, QMessageBox, QSizePolicy, QScrollArea, QShortcut
 )
-from PyQt5.QtGui import QPixmap, QFont
-from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QPixmap, QFont, QKeySequence
+from PyQt5.QtCore import Qt, QTimer, pyqtSignal
 from io import BytesIO
 
-CHANNELS_FILE = "RSS_channels.json"
+import http_client
+from channel_health import OK
+from channel_resolver import channel_refs
+from feed_fetcher import FETCH_WORKERS
+from instrumentation import timed
+from list_models import ChannelListModel, ListView, VideoListModel
+from reader_core import ReaderCore
+from thumbnail_cache import ThumbnailCache
+from thumbnail_loader import PREFETCH_FIRST, PREFETCH_NEIGHBOURS, ThumbnailLoader
+from timeline import ALL_CHANNELS
+
+# Virtuální "kanál" s výsledky fulltextového hledání
+SEARCH_RESULTS = "Výsledky hledání"
+
+
+def download_thumbnail(url):
+    """Stažení náhledu (volá se z pracovního vlákna ThumbnailLoader)"""
+    return http_client.get(url).content
+
+
+def thumbnail_url(video):
+    """URL náhledu videa"""
+    return video.thumbnail
+
 
 class YoutubeRssReader(QWidget):
-    def __init__(self):
+    # Výsledek stažení feedu z pracovního vlákna (název, ID, feed nebo None)
+    feed_loaded = pyqtSignal(str, str, object)
+    # Vyřízený odkaz z přidávání kanálů (dávka, odkaz, ID nebo None, feed nebo None)
+    channel_fetched = pyqtSignal(object, str, object, object)
+
+    def __init__(self, fetch_workers=FETCH_WORKERS):
         super().__init__()
         self.setWindowTitle("YouTube RSS channels reader")
         self.setGeometry(100, 100, 1200, 800)
@@ -34,7 +55,8 @@ class YoutubeRssReader(QWidget):
         main_layout.addLayout(left_panel, 2)
 
         # Inicializace channel_list a dalších widgetů
-        self.channel_list = QListWidget()
+        self.channel_model = ChannelListModel([ALL_CHANNELS])
+        self.channel_list = ListView(self.channel_model)
         self.channel_list.setFixedHeight(650)  # Fixní výška pro seznam kanálů
         left_panel.addWidget(QLabel("Kanály:"))
         left_panel.addWidget(self.channel_list)
@@ -45,14 +67,24 @@ class YoutubeRssReader(QWidget):
         self.remove_channel_btn = QPushButton("Odebrat vybraný kanál")
         left_panel.addWidget(self.remove_channel_btn)
 
+        # Skok na další nezhlédnuté video (i v dalších kanálech), zkratka N
+        self.next_unread_btn = QPushButton("Další nezhlédnuté (N)")
+        left_panel.addWidget(self.next_unread_btn)
+
         # Pravý panel: seznam videí + náhled + popis
         right_panel = QVBoxLayout()
         main_layout.addLayout(right_panel, 5)
 
+        # Pole pro fulltextové hledání ve všech kanálech
+        self.search_box = QLineEdit()
+        self.search_box.setPlaceholderText("Hledat ve všech kanálech...")
+        self.search_box.setClearButtonEnabled(True)
+        right_panel.addWidget(self.search_box)
         right_panel.addWidget(QLabel("Videa:"))
         
         # Vytvoření scroll area pro seznam videí, aby se objevil posuvník, pokud bude seznam dlouhý
-        self.video_list = QListWidget()
+        self.video_model = VideoListModel()
+        self.video_list = ListView(self.video_model)
         self.video_list.setFixedHeight(200)  # Fixní výška pro seznam videí
         right_panel.addWidget(self.video_list)
 
@@ -74,18 +106,36 @@ class YoutubeRssReader(QWidget):
         right_panel.addWidget(self.description_scroll_area, 1)
 
         # Data
-        self.channels = {}  # channel_name -> {'id': channel_id, 'entries': [...]}
         self.current_channel = None
+        self.search_names = []
+        self.search_videos = []
 
         # Signály
         self.add_channel_btn.clicked.connect(self.add_channel)
         self.remove_channel_btn.clicked.connect(self.remove_channel)
         self.channel_list.currentRowChanged.connect(self.channel_changed)
+        self.search_box.textChanged.connect(self.search_changed)
         self.video_list.currentRowChanged.connect(self.video_selected)
-        self.video_list.itemDoubleClicked.connect(self.open_video)
-
-        # Načti uložené kanály
+        self.video_list.doubleClicked.connect(self.open_video)
+        self.feed_loaded.connect(self.on_feed_loaded)
+        self.channel_fetched.connect(self.on_channel_fetched)
+        # Ladicí panel s měřeními (vytvoří se až při prvním otevření)
+        self.debug_panel = None
+        QShortcut(QKeySequence("F12"), self, self.show_debug_panel)
+        self.next_unread_btn.clicked.connect(self.next_unread)
+        QShortcut(QKeySequence("N"), self, self.next_unread)
+        # Kanály, úložiště a stahování drží jádro bez GUI (reader_core.py)
+        self.core = ReaderCore(self.feed_loaded.emit, fetch_workers)
+        # Nezhlédnutá videa se v seznamu označí podle stavu v jádře
+        self.video_model.is_watched = self.core.watch.is_watched
+        self.thumbnails = ThumbnailCache()
+        self.thumbnail_loader = ThumbnailLoader(self.thumbnails, download_thumbnail)
+        self.thumbnail_loader.loaded.connect(self.on_thumbnail_loaded)
+        self.thumbnail_loader.prefetched.connect(self.on_thumbnail_prefetched)
+
+        # Načti uložené kanály, obnova ze sítě začne až po prvním vykreslení okna
         self.load_channels()
+        QTimer.singleShot(0, self.start_refresh)
 
         # Nastavení fontu po inicializaci všech widgetů
         self.set_font()
@@ -102,36 +152,44 @@ class YoutubeRssReader(QWidget):
         self.description_label.setFont(font)
 
     def add_channel(self):
-        """Přidání nového YouTube kanálu"""
-        channel_id, ok = QInputDialog.getText(self, "Zadej channel ID-UC kanal!", "UC kanál ID example (UCxxxxxxxx):")
-        
-        # Validace, že ID začíná na "UC" a je správného formátu
-        if not ok or not channel_id.startswith("UC") or not re.match(r"^UC[\w-]+$", channel_id):
-            QMessageBox.warning(self, "Chyba", "Neplatné channel ID, kanál nebude přidán. Ujistěte se, že ID začíná na 'UC' a má správný formát.")
-            return
-
-        # Načítání RSS feedu pro kanál
-        rss_url = f"https://www.youtube.com/feeds/videos.xml?channel_id={channel_id}"
-        feed = feedparser.parse(rss_url)
-        if not feed.entries:
-            QMessageBox.warning(self, "Chyba", "Nepodařilo se načíst videa z tohoto kanálu.")
+        """Přidání YouTube kanálů podle UC ID, URL nebo @handle (i více najednou)"""
+        text, ok = QInputDialog.getMultiLineText(
+            self, "Přidat kanály", "UC ID, URL kanálu nebo @handle (více kanálů na samostatných řádcích):"
+        )
+        if not ok or not text.strip():
             return
 
-        # Načtení názvu kanálu a videí
-        channel_title = feed.feed.get("title", channel_id)
-        self.channels[channel_title] = {"id": channel_id, "entries": feed.entries}
-
-        # Přidání kanálu do seznamu, pokud již neexistuje
-        existing_channels = [self.channel_list.item(i).text() for i in range(self.channel_list.count())]
-        if channel_title not in existing_channels:
-            self.channel_list.addItem(channel_title)
+        # Převod na UC ID a načtení feedů běží na pozadí, okno zůstává ovladatelné;
+        # kanály se do seznamu přidávají postupně v on_channel_fetched
+        refs = channel_refs(text)
+        batch = {"refs": refs, "left": len(refs), "added": [], "failed": []}
+        self.core.add_channels(
+            refs, lambda ref, channel_id, feed: self.channel_fetched.emit(batch, ref, channel_id, feed)
+        )
 
-        # Nastavení vybraného kanálu
-        idx = self.channel_list.findItems(channel_title, Qt.MatchExactly)[0]
-        self.channel_list.setCurrentItem(idx)
+    def on_channel_fetched(self, batch, ref, channel_id, feed):
+        """Přidání jednoho vyřízeného kanálu v GUI vlákně, po celé dávce výběr a hlášení chyb"""
+        channel_title = self.core.add_fetched(channel_id, feed)
+        if channel_title is None:
+            batch["failed"].append(ref)
+        else:
+            # Přidání kanálu do seznamu, pokud již neexistuje
+            self.channel_model.add(channel_title)
+            self.channel_model.set_state(channel_title, OK)
+            self.update_unread(channel_title)
+            batch["added"].append(channel_title)
+            if self.current_channel == ALL_CHANNELS:
+                self.reload_current_videos()
+        batch["left"] -= 1
+        if batch["left"]:
+            return
 
-        # Uložení kanálů
-        self.save_channels()
+        # Nastavení posledního přidaného kanálu jako vybraného
+        if batch["added"]:
+            self.channel_list.setCurrentRow(self.channel_model.row(batch["added"][-1]))
+        failed = [ref for ref in batch["refs"] if ref in batch["failed"]]
+        if failed:
+            QMessageBox.warning(self, "Chyba", "Nepodařilo se načíst videa z těchto kanálů:\n" + "\n".join(failed))
 
     def remove_channel(self):
         """Odebrání vybraného kanálu"""
@@ -140,7 +198,10 @@ class YoutubeRssReader(QWidget):
             QMessageBox.information(self, "Odebrat kanál", "Nejprve vyber kanál k odebrání.")
             return
 
-        channel_name = self.channel_list.item(current_row).text()
+        channel_name = self.channel_model.name(current_row)
+        if channel_name == ALL_CHANNELS:
+            QMessageBox.information(self, "Odebrat kanál", "Nejprve vyber kanál k odebrání.")
+            return
 
         confirm = QMessageBox.question(
             self, "Potvrzení odebrání",
@@ -149,83 +210,144 @@ class YoutubeRssReader(QWidget):
         )
 
         if confirm == QMessageBox.Yes:
-            # Odebrání kanálu z dat
-            if channel_name in self.channels:
-                del self.channels[channel_name]
+            # Odebrání kanálu z dat (včetně uložení změn)
+            self.core.remove_channel(channel_name)
 
             # Odebrání kanálu z UI
-            self.channel_list.takeItem(current_row)
-            self.video_list.clear()
+            self.channel_model.remove(channel_name)
+            self.update_unread(ALL_CHANNELS)
+            self.video_model.clear()
             self.thumbnail_label.clear()
             self.description_label.setText("Vyberte video pro zobrazení podrobností.")
             self.current_channel = None
 
-            # Uložení změn
-            self.save_channels()
-
     def channel_changed(self, index):
         """Změna vybraného kanálu"""
         if index < 0:
             return
-        channel_name = self.channel_list.item(index).text()
+        channel_name = self.channel_model.name(index)
         self.current_channel = channel_name
+        self.search_box.blockSignals(True)
+        self.search_box.clear()
+        self.search_box.blockSignals(False)
         self.load_videos_for_channel(channel_name)
 
+    def search_changed(self, text):
+        """Fulltextové hledání ve všech kanálech při psaní"""
+        if not text.strip():
+            # Po smazání dotazu se vrátí seznam vybraného kanálu
+            if self.current_channel == SEARCH_RESULTS:
+                self.current_channel = None
+                self.video_model.clear()
+                self.channel_changed(self.channel_list.currentRow())
+            return
+        self.search_names, self.search_videos = self.core.search(text)
+        self.current_channel = SEARCH_RESULTS
+        self.load_videos_for_channel(SEARCH_RESULTS)
+
     def load_videos_for_channel(self, channel_name):
         """Načtení videí pro vybraný kanál"""
-        self.video_list.clear()
+        self.thumbnail_loader.cancel()
         self.thumbnail_label.clear()
         self.description_label.setText("Vyberte video pro zobrazení podrobností.")
 
-        entries = self.channels[channel_name]["entries"]
-        for entry in entries:
-            self.video_list.addItem(entry.title)
+        # Model drží jen odkaz na seznam, řádky se vykreslují až ve viditelné části
+        entries = self.channel_entries(channel_name)
+        with timed("video_list_render"):
+            if channel_name == ALL_CHANNELS:
+                # Sloučená osa se při obnově mění na místě, model dostane kopii
+                # (výběr se v reload_current_videos hledá ve starém seznamu)
+                self.video_model.set_videos(list(entries), list(self.core.timeline.names))
+            elif channel_name == SEARCH_RESULTS:
+                self.video_model.set_videos(entries, self.search_names)
+            else:
+                self.video_model.set_videos(entries)
+
+        # Přednačtení náhledů prvních videí, přednačítání předchozího kanálu se zastaví
+        self.thumbnail_loader.cancel_prefetch()
+        self.prefetch_thumbnails(range(PREFETCH_FIRST))
+
+    def prefetch_thumbnails(self, rows):
+        """Naplánování přednačtení náhledů pro zadané řádky seznamu videí"""
+        entries = self.channel_entries(self.current_channel)
+        size = (self.thumbnail_label.width(), self.thumbnail_label.height())
+        keys = []
+        for row in rows:
+            if 0 <= row < len(entries):
+                url = thumbnail_url(entries[row])
+                if url and (url, *size) not in self.thumbnails.memory.items:
+                    keys.append((url, *size))
+        self.thumbnail_loader.prefetch(keys)
 
     def video_selected(self, index):
         """Zobrazení detailů videa"""
         if index < 0 or self.current_channel is None:
+            self.thumbnail_loader.cancel()
             self.thumbnail_label.clear()
             self.description_label.setText("Vyberte video pro zobrazení podrobností.")
             return
 
-        entries = self.channels[self.current_channel]["entries"]
+        entries = self.channel_entries(self.current_channel)
         if index >= len(entries):
             return
 
         video = entries[index]
-        title = video.get("title", "Bez názvu")
-        published = video.get("published", "")
-        summary = video.get("summary", "")
+        title = video.title or "Bez názvu"
+        published = video.published
+        summary = video.summary
 
         self.description_label.setText(f"<b>{title}</b>\n{published}\n\n{summary}")
 
+        # Přednačtení sousedních náhledů pro rychlé procházení šipkami
+        self.prefetch_thumbnails(range(index - PREFETCH_NEIGHBOURS, index + PREFETCH_NEIGHBOURS + 1))
+
         # Načtení náhledu videa
-        thumbnail_url = None
-        if "media_thumbnail" in video:
-            thumbnail_url = video.media_thumbnail[0]["url"]
-        elif "media_content" in video:
-            thumbnail_url = video.media_content[0]["url"]
-
-        if thumbnail_url:
-            try:
-                response = requests.get(thumbnail_url)
-                image = QPixmap()
-                image.loadFromData(response.content)
-                scaled = image.scaled(self.thumbnail_label.width(), self.thumbnail_label.height(), Qt.KeepAspectRatio, Qt.SmoothTransformation)
-                self.thumbnail_label.setPixmap(scaled)
-            except Exception:
-                self.thumbnail_label.clear()
+        url = thumbnail_url(video)
+        if url:
+            # Opakovaný výběr se vykreslí z paměťové cache bez síťového přístupu
+            key = (url, self.thumbnail_label.width(), self.thumbnail_label.height())
+            cached = self.thumbnails.memory.get(key)
+            if cached is not None:
+                self.thumbnail_loader.cancel()
+                self.thumbnail_label.setPixmap(cached)
+                return
+            # Stažení a dekódování běží na pozadí, dřívější požadavky se zruší
+            self.thumbnail_label.clear()
+            self.thumbnail_loader.request(*key)
         else:
+            self.thumbnail_loader.cancel()
+            self.thumbnail_label.clear()
+
+    def on_thumbnail_prefetched(self, generation, key, image):
+        """Uložení přednačteného náhledu do paměťové cache"""
+        if generation == self.thumbnail_loader.prefetch_generation:
+            with timed("thumbnail_pixmap"):
+                pixmap = QPixmap.fromImage(image)
+            self.thumbnails.memory.put(key, pixmap)
+
+    def on_thumbnail_loaded(self, generation, key, image, error):
+        """Zobrazení náhledu, pokud patří k aktuálně vybranému videu"""
+        if not self.thumbnail_loader.is_current(generation):
+            return
+        if image is None:
             self.thumbnail_label.clear()
+            return
+        with timed("thumbnail_pixmap"):
+            pixmap = QPixmap.fromImage(image)
+        self.thumbnails.memory.put(key, pixmap)
+        self.thumbnail_label.setPixmap(pixmap)
 
-    def open_video(self, item):
+    def open_video(self, model_index):
         """Otevření videa v prohlížeči"""
         index = self.video_list.currentRow()
         if self.current_channel is None or index < 0:
             return
 
-        entries = self.channels[self.current_channel]["entries"]
+        entries = self.channel_entries(self.current_channel)
         video = entries[index]
+        self.mark_watched(index, video)
+        import webbrowser
+
         webbrowser.open(video.link)
 
     def on_thumbnail_click(self, event):
@@ -234,72 +356,109 @@ class YoutubeRssReader(QWidget):
         if self.current_channel is None or index < 0:
             return
 
-        entries = self.channels[self.current_channel]["entries"]
+        entries = self.channel_entries(self.current_channel)
         video = entries[index]
+        self.mark_watched(index, video)
+        import webbrowser
+
         webbrowser.open(video.link)
 
-    def extract_channel_id(self, url):
-        """Extrahování ID kanálu z URL"""
-        try:
-            if not url.endswith("/about"):
-                if url.endswith("/"):
-                    url += "about"
-                else:
-                    url += "/about"
-
-            headers = {"User-Agent": "Mozilla/5.0"}
-            response = requests.get(url, headers=headers)
-            html = response.text
-
-            match = re.search(r'<link rel="canonical" href="https://www\.youtube\.com/channel/(UC[\w-]+)"', html)
-            if match:
-                return match.group(1)
-
-            match2 = re.search(r'<meta\s+itemprop="channelId"\s+content="(UC[\w-]+)"', html)
-            if match2:
-                return match2.group(1)
-
-            match3 = re.search(r'<meta\s+property="og:url"\s+content="https://www\.youtube\.com/channel/(UC[\w-]+)"', html)
-            if match3:
-                return match3.group(1)
-
-            scripts = re.findall(r'<script[^>]*>(.*?)</script>', html, flags=re.DOTALL)
-            for script in scripts:
-                if 'channelId' in script:
-                    json_matches = re.findall(r'("channelId":"(UC[\w-]+)")', script)
-                    if json_matches:
-                        return json_matches[0][1]
-
-            return None
-        except Exception as e:
-            print(f"Chyba při získávání channel_id:", e)
-            return None
-
-    def save_channels(self):
-        """Uložení kanálů do souboru"""
-        try:
-            # Uložíme pouze názvy a id kanálů (videá stáhneme při načtení)
-            data_to_save = {name: info["id"] for name, info in self.channels.items()}
-            with open(CHANNELS_FILE, "w", encoding="utf-8") as f:
-                json.dump(data_to_save, f, ensure_ascii=False, indent=4)
-        except Exception as e:
-            print(f"Chyba při ukládání kanálů: {e}")
+    def mark_watched(self, row, video):
+        """Označení otevřeného videa jako zhlédnutého a úprava počtů jen u jeho kanálu"""
+        names = self.video_model.names
+        channel_name = names[row] if names is not None else self.current_channel
+        if self.core.mark_watched(channel_name, video):
+            self.video_model.video_changed(row)
+            self.update_unread(channel_name)
+
+    def update_unread(self, channel_name):
+        """Počet nezhlédnutých videí u kanálu a u položky všech kanálů"""
+        self.channel_model.set_unread(channel_name, self.core.unread_count(channel_name))
+        self.channel_model.set_unread(ALL_CHANNELS, self.core.unread_count(ALL_CHANNELS))
+
+    def next_unread(self):
+        """Výběr dalšího nezhlédnutého videa, případně v dalším kanálu s nezhlédnutými videi"""
+        # Z výsledků hledání se skáče v seznamu kanálů
+        if self.current_channel == SEARCH_RESULTS:
+            self.search_box.clear()
+        if self.current_channel is not None:
+            row = self.core.next_unread(self.current_channel, self.video_list.currentRow() + 1)
+            if row >= 0:
+                self.video_list.setCurrentRow(row)
+                return
+        channel_name = self.core.next_unread_channel(self.channel_model.names, self.current_channel)
+        if channel_name is None:
+            return
+        self.channel_list.setCurrentRow(self.channel_model.row(channel_name))
+        self.video_list.setCurrentRow(self.core.next_unread(channel_name))
 
     def load_channels(self):
         """Načtení kanálů ze souboru"""
-        try:
-            if os.path.exists(CHANNELS_FILE):
-                with open(CHANNELS_FILE, "r", encoding="utf-8") as f:
-                    saved_channels = json.load(f)
-                
-                for channel_name, channel_id in saved_channels.items():
-                    rss_url = f"https://www.youtube.com/feeds/videos.xml?channel_id={channel_id}"
-                    feed = feedparser.parse(rss_url)
-                    if feed.entries:
-                        self.channels[channel_name] = {"id": channel_id, "entries": feed.entries}
-                        self.channel_list.addItem(channel_name)
-        except Exception as e:
-            print(f"Chyba při načítání kanálů: {e}")
+        # Okamžité zobrazení z lokálního úložiště, aktualizace ze sítě běží na pozadí
+        self.core.load_channels()
+        # Kanály bez uložených videí, které se nedaří stáhnout, jsou v seznamu označené
+        names = [*self.core.channels, *self.core.failed_channels()]
+        self.channel_model.set_names([ALL_CHANNELS, *names])
+        for channel_name in names:
+            self.channel_model.set_state(channel_name, *self.core.channel_state(channel_name))
+        # Počty nezhlédnutých videí spočítalo jádro při načtení, dál se mění jen přírůstkově
+        for channel_name in [ALL_CHANNELS, *names]:
+            self.channel_model.set_unread(channel_name, self.core.unread_count(channel_name))
+
+    def start_refresh(self):
+        """Stažení všech kanálů a spuštění průběžné obnovy na pozadí"""
+        self.core.refresh_all()
+        self.core.start()
+
+    def on_feed_loaded(self, channel_name, channel_id, feed):
+        """Zpracování staženého feedu v GUI vlákně"""
+        changed = self.core.apply_feed(channel_name, channel_id, feed)
+        state, message = self.core.channel_state(channel_name)
+        # Odebraný kanál nebo chyba sítě, zůstávají zobrazena data z úložiště a kanál se jen označí
+        if changed is None:
+            if state != OK:
+                self.channel_model.add(channel_name)
+                self.channel_model.set_state(channel_name, state, message)
+            return
+        self.channel_model.add(channel_name)
+        self.channel_model.set_state(channel_name, state, message)
+        self.update_unread(channel_name)
+        # 304 znamená beze změny, seznam videí není třeba překreslovat
+        if changed and self.current_channel in (channel_name, ALL_CHANNELS):
+            self.reload_current_videos()
+
+    def channel_entries(self, channel_name):
+        """Videa kanálu; pro virtuální položky sloučená osa nebo výsledky hledání"""
+        if channel_name == SEARCH_RESULTS:
+            return self.search_videos
+        return self.core.channel_entries(channel_name)
+
+    def reload_current_videos(self):
+        """Překreslení seznamu videí aktuálního kanálu se zachováním výběru"""
+        row = self.video_list.currentRow()
+        selected = self.video_model.video(row).video_id if row >= 0 else None
+        self.video_list.blockSignals(True)
+        self.load_videos_for_channel(self.current_channel)
+        self.video_list.blockSignals(False)
+        if selected is not None:
+            row = self.video_model.row(selected)
+            if row >= 0:
+                self.video_list.setCurrentRow(row)
+
+    def show_debug_panel(self):
+        """Okno s dobami stahování, parsování, náhledů a zápisů (F12)"""
+        if self.debug_panel is None:
+            from debug_panel import DebugPanel
+
+            self.debug_panel = DebugPanel(self.core.subscriptions, self)
+        self.debug_panel.show()
+        self.debug_panel.raise_()
+
+    def closeEvent(self, event):
+        """Zastavení stahování při zavření okna"""
+        self.core.shutdown()
+        self.thumbnail_loader.shutdown()
+        super().closeEvent(event)
 
 
 if __name__ == "__main__":
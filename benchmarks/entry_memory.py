@@ -0,0 +1,42 @@
+"""Paměť na jedno video: plné záznamy feedparseru vs. kompaktní Video
+
+Spuštění z kořene repozitáře:  python benchmarks/entry_memory.py [počet_kanálů]
+"""
+import gc
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import feedparser  # noqa: E402
+
+from benchmarks.fixtures import youtube_feed_xml  # noqa: E402
+from video import Video  # noqa: E402
+
+
+def retained_bytes(build, feeds):
+    """Velikost paměti, která zůstane držená výsledkem build(feed)"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = [build(feedparser.parse(data)) for data in feeds]
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    count = sum(len(entries) for entries in kept)
+    return (after - before) / count, count
+
+
+def main():
+    channels = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    feeds = [youtube_feed_xml(i) for i in range(channels)]
+    raw, count = retained_bytes(lambda feed: feed.entries, feeds)
+    compact, _ = retained_bytes(lambda feed: [Video.from_entry(entry) for entry in feed.entries], feeds)
+    print(f"videí: {count}")
+    print(f"FeedParserDict: {raw:8.0f} B/video")
+    print(f"Video (__slots__): {compact:8.0f} B/video  ({compact / raw:.0%})")
+
+
+if __name__ == "__main__":
+    main()
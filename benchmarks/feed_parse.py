@@ -0,0 +1,87 @@
+"""Propustnost parsování: feedparser + Video.from_entry vs. proudový youtube_feed
+
+Spuštění z kořene repozitáře:
+    python benchmarks/feed_parse.py [--channels 200] [--repeat 5] [uložené_feedy.xml ...]
+
+Bez souborů se použijí syntetické feedy z benchmarks/fixtures.py. Před měřením
+se ověří, že oba parsery vrací stejná videa.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import feedparser  # noqa: E402
+
+import youtube_feed  # noqa: E402
+from benchmarks.fixtures import youtube_feed_xml  # noqa: E402
+from video import Video  # noqa: E402
+
+
+def with_feedparser(data):
+    feed = feedparser.parse(data)
+    return feed.feed.get("title"), [Video.from_entry(entry) for entry in feed.entries]
+
+
+def with_youtube_feed(data):
+    return youtube_feed.parse(data)
+
+
+def fields(video):
+    return tuple(getattr(video, name) for name in Video.__slots__)
+
+
+def check(feeds):
+    """Oba parsery musí dát stejný název kanálu a stejná videa"""
+    for index, data in enumerate(feeds):
+        expected = with_feedparser(data)
+        title, videos = with_youtube_feed(data)
+        if title != expected[0] or [fields(v) for v in videos] != [fields(v) for v in expected[1]]:
+            for ours, theirs in zip(videos, expected[1]):
+                for name, a, b in zip(Video.__slots__, fields(ours), fields(theirs)):
+                    if a != b:
+                        print(f"feed {index}, {name}: {a!r} != {b!r}")
+                        break
+            raise SystemExit(f"feed {index}: parsery se liší")
+
+
+def measure(parse, feeds, repeat):
+    """Nejlepší čas z několika průchodů přes všechny feedy"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for data in feeds:
+            parse(data)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("files", nargs="*", help="uložené feedy z youtube.com")
+    parser.add_argument("--channels", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    if args.files:
+        feeds = []
+        for path in args.files:
+            with open(path, "rb") as f:
+                feeds.append(f.read())
+    else:
+        feeds = [youtube_feed_xml(i) for i in range(args.channels)]
+    check(feeds)
+    size = sum(len(data) for data in feeds) / 1e6
+    print(f"feedů: {len(feeds)}, {size:.1f} MB")
+    baseline = None
+    for name, parse in (("feedparser", with_feedparser), ("youtube_feed", with_youtube_feed)):
+        elapsed = measure(parse, feeds, args.repeat)
+        baseline = baseline or elapsed
+        print(f"{name:>12}: {len(feeds) / elapsed:8.0f} feedů/s  {size / elapsed:6.1f} MB/s  "
+              f"({baseline / elapsed:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
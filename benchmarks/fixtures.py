@@ -0,0 +1,174 @@
+"""Syntetické YouTube Atom feedy a lokální náhrada youtube.com pro benchmarky"""
+import datetime
+import struct
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+from xml.sax.saxutils import escape
+
+FEED_SIZE = 15  # YouTube vrací posledních 15 videí
+
+
+def channel_id(index):
+    return f"UC{index:022d}"
+
+
+def video_id(channel_index, video_index):
+    return f"v{channel_index:06d}{video_index:04d}"
+
+
+def youtube_feed_xml(channel_index, count=FEED_SIZE, title=None, thumbnail_base="https://i1.ytimg.com", generation=0):
+    """Atom feed kanálu ve formátu https://www.youtube.com/feeds/videos.xml
+
+    Každá další generace feedu má na začátku jedno nové video (jako po nahrání).
+    """
+    cid = channel_id(channel_index)
+    title = escape(title or f"Kanál {channel_index}")
+    start = datetime.datetime(2026, 10, 1, tzinfo=datetime.timezone.utc) + datetime.timedelta(hours=26 * generation)
+    entries = []
+    for position in range(count):
+        i = generation + count - 1 - position
+        vid = video_id(channel_index, i)
+        date = (start - datetime.timedelta(hours=channel_index % 48 + position * 26)).isoformat()
+        entries.append(f"""
+ <entry>
+  <id>yt:video:{vid}</id>
+  <yt:videoId>{vid}</yt:videoId>
+  <yt:channelId>{cid}</yt:channelId>
+  <title>Video {i} kanálu {channel_index} &amp; další</title>
+  <link rel="alternate" href="https://www.youtube.com/watch?v={vid}"/>
+  <author>
+   <name>{title}</name>
+   <uri>https://www.youtube.com/channel/{cid}</uri>
+  </author>
+  <published>{date}</published>
+  <updated>{date}</updated>
+  <media:group>
+   <media:title>Video {i} kanálu {channel_index} &amp; další</media:title>
+   <media:content url="https://www.youtube.com/v/{vid}?version=3" type="application/x-shockwave-flash" width="640" height="390"/>
+   <media:thumbnail url="{thumbnail_base}/vi/{vid}/hqdefault.jpg" width="480" height="360"/>
+   <media:description>Popis videa {i}. {"Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 6}
+Odkazy: https://example.com/{vid}</media:description>
+   <media:community>
+    <media:starRating count="{100 + i}" average="5.00" min="1" max="5"/>
+    <media:statistics views="{1000 * (i + 1)}"/>
+   </media:community>
+  </media:group>
+ </entry>""")
+    return f"""<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns:yt="http://www.youtube.com/xml/schemas/2015" xmlns:media="http://search.yahoo.com/mrss/" xmlns="http://www.w3.org/2005/Atom">
+ <link rel="self" href="http://www.youtube.com/feeds/videos.xml?channel_id={cid}"/>
+ <id>yt:channel:{cid}</id>
+ <yt:channelId>{cid}</yt:channelId>
+ <title>{title}</title>
+ <link rel="alternate" href="https://www.youtube.com/channel/{cid}"/>
+ <author>
+  <name>{title}</name>
+  <uri>https://www.youtube.com/channel/{cid}</uri>
+ </author>
+ <published>2015-01-01T00:00:00+00:00</published>{"".join(entries)}
+</feed>
+""".encode("utf-8")
+
+
+def thumbnail_png(width=480, height=360):
+    """PNG obrázek s rozměry i velikostí (~20 kB) jako hqdefault.jpg; stačí na něj zlib, bez Qt"""
+    rows = b"".join(
+        b"\x00" + bytes((x // 6) * (y // 6) * 37 % 256 for x in range(width * 3))
+        for y in range(height)
+    )
+
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", zlib.compress(rows, 6)) + chunk(b"IEND", b"")
+
+
+class FeedHandler(BaseHTTPRequestHandler):
+    """Náhrada youtube.com: feedy podle ?channel_id=UC... a náhledy /vi/<id>/hqdefault.jpg
+
+    Index kanálu je v čísle ID, ?generation=N vrací N-tou verzi feedu.
+    Chování (zpoždění, chyby, 304) určuje server.options, viz serve_feeds.
+    """
+
+    protocol_version = "HTTP/1.1"  # keep-alive jako u youtube.com
+    disable_nagle_algorithm = True  # hlavičky a tělo se posílají zvlášť, bez toho +40 ms (delayed ACK)
+
+    def do_GET(self):
+        options = self.server.options
+        if options["latency"]:
+            time.sleep(options["latency"])
+        url = urlsplit(self.path)
+        if url.path.startswith("/vi/"):
+            self.count("thumb")
+            self.send_body(self.server.thumbnail, "image/jpeg")
+            return
+        query = parse_qs(url.query)
+        cid = query.get("channel_id", [""])[0]
+        try:
+            index = int(cid[2:])
+            generation = int(query.get("generation", ["0"])[0])
+        except ValueError:
+            self.count("error")
+            self.send_error(404)
+            return
+        # Chybující kanály jsou dané indexem, takže jsou stejné v každém běhu
+        if (index * 2654435761) % 1000 < options["error_rate"] * 1000:
+            self.count("error")
+            self.send_error(options["error_status"])
+            return
+        etag = f'"{cid}-{generation}"'
+        if options["not_modified"] and self.headers.get("If-None-Match") == etag:
+            self.count("304")
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.count("200")
+        body = youtube_feed_xml(index, options["feed_size"], thumbnail_base=self.server.base_url, generation=generation)
+        self.send_body(body, "application/atom+xml; charset=UTF-8", {"ETag": etag} if options["not_modified"] else {})
+
+    def send_body(self, body, content_type, headers=None):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def count(self, kind):
+        with self.server.lock:
+            self.server.counts[kind] = self.server.counts.get(kind, 0) + 1
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve_feeds(latency=0.0, error_rate=0.0, error_status=503, not_modified=True, feed_size=FEED_SIZE):
+    """Spustí lokální náhradu youtube.com na volném portu; vrací (server, RSS_URL)
+
+    latency      zpoždění každé odpovědi v sekundách
+    error_rate   podíl kanálů, jejichž feed vždy skončí chybou error_status
+    not_modified odpovídat 304 na If-None-Match se stejnou generací feedu
+    server.counts počítá odpovědi ("200", "304", "error", "thumb").
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FeedHandler)
+    server.daemon_threads = True
+    server.options = {
+        "latency": latency,
+        "error_rate": error_rate,
+        "error_status": error_status,
+        "not_modified": not_modified,
+        "feed_size": feed_size,
+    }
+    server.base_url = f"http://127.0.0.1:{server.server_port}"
+    server.thumbnail = thumbnail_png()
+    server.counts = {}
+    server.lock = threading.Lock()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"{server.base_url}/feeds/videos.xml?channel_id={{}}"
@@ -0,0 +1,124 @@
+"""Doba startu GUI: import, zobrazení okna a první kanál v seznamu
+
+Každé měření běží v novém procesu proti lokálnímu serveru s feedy.
+"Studený" start má prázdné úložiště (první kanál přijde ze sítě),
+"teplý" start načte kanály z RSS_store.db předchozího běhu.
+
+Spuštění z kořene repozitáře:
+    python benchmarks/startup.py [--module RSSReaderD] [--channels 20] [--repeat 5]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.fixtures import channel_id, serve_feeds  # noqa: E402
+
+# Moduly, které se při startu importovat nemají
+DEFERRED_MODULES = ("feedparser", "requests", "urllib3", "webbrowser")
+FIRST_CHANNEL_TIMEOUT = 30.0
+
+
+def child(module_name, rss_url):
+    """Jedno spuštění aplikace; výsledky v ms vypíše jako JSON"""
+    start = time.perf_counter()
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    module = __import__(module_name)
+    imported = time.perf_counter()
+    loaded = [name for name in DEFERRED_MODULES if name in sys.modules]
+
+    import feed_fetcher
+    from PyQt5.QtWidgets import QApplication
+
+    feed_fetcher.RSS_URL = rss_url
+    app = QApplication(sys.argv[:1])
+    window = module.YoutubeRssReader()
+    window.show()
+    app.processEvents()
+    shown = time.perf_counter()
+
+    # První řádek seznamu je virtuální položka všech kanálů
+    first_channel = None
+    while time.perf_counter() - shown < FIRST_CHANNEL_TIMEOUT:
+        if window.channel_model.rowCount() > 1:
+            first_channel = time.perf_counter()
+            break
+        app.processEvents()
+        time.sleep(0.001)
+    # Dokončení stažení, aby teplý start měl všechny kanály v úložišti
+    while window.core.pending_channels and time.perf_counter() - shown < FIRST_CHANNEL_TIMEOUT:
+        app.processEvents()
+        time.sleep(0.001)
+    # closeEvent počká na vlákna náhledů; rozběhnutá stažení feedů musí doběhnout,
+    # dokud okno (cíl signálů) i QApplication existují
+    window.close()
+    window.thumbnail_loader.shutdown()
+    window.core.fetcher.shutdown(wait=True)
+    print(json.dumps({
+        "import": (imported - start) * 1000,
+        "window": (shown - start) * 1000,
+        "first_channel": (first_channel - start) * 1000 if first_channel else None,
+        "loaded": loaded,
+    }))
+    # Okno se ruší před QApplication, ne v náhodném pořadí při úklidu lokálních proměnných
+    del window
+    app.processEvents()
+    del app
+
+
+def run_child(module_name, rss_url, workdir):
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child", module_name, rss_url],
+        cwd=workdir, capture_output=True, text=True, check=True,
+        env=dict(os.environ, PYTHONPATH=ROOT),
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def report(label, results):
+    print(label)
+    for key in ("import", "window", "first_channel"):
+        values = [result[key] for result in results if result[key] is not None]
+        if values:
+            print(f"  {key:>14}: medián {statistics.median(values):7.1f} ms, min {min(values):7.1f} ms")
+        else:
+            print(f"  {key:>14}: nedosaženo")
+    loaded = sorted({name for result in results for name in result["loaded"]})
+    print(f"  importováno při startu: {', '.join(loaded) or '-'}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default="RSSReaderD")
+    parser.add_argument("--channels", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--child", nargs=2, metavar=("MODULE", "RSS_URL"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(*args.child)
+        return
+
+    server, rss_url = serve_feeds()
+    channels = {f"Kanál {i}": channel_id(i) for i in range(1, args.channels + 1)}
+    cold, warm = [], []
+    for _ in range(args.repeat):
+        with tempfile.TemporaryDirectory() as workdir:
+            with open(os.path.join(workdir, "RSS_channels.json"), "w", encoding="utf-8") as f:
+                json.dump(channels, f)
+            cold.append(run_child(args.module, rss_url, workdir))
+            warm.append(run_child(args.module, rss_url, workdir))
+    server.shutdown()
+    print(f"{args.module}, {args.channels} kanálů, {args.repeat} opakování")
+    report("Studený start (prázdné úložiště):", cold)
+    report("Teplý start (kanály z úložiště):", warm)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,266 @@
+"""Sada výkonnostních měření proti lokální náhradě youtube.com (bez internetu)
+
+Měří jádro čtečky (ReaderCore) a načítání náhledů:
+  - start až po všechny kanály: studený (prázdné úložiště) a teplý (z RSS_store.db)
+  - propustnost obnovy: změněné feedy (200) a nezměněné (304)
+  - parsování jednoho feedu
+  - latence náhledu: studená (síť) a teplá (disková cache)
+  - maximální paměť procesu (RSS)
+
+Každé opakování běží v novém procesu a prázdném adresáři, server je
+v hlavním procesu. Výsledky (mediány) jde uložit a porovnat s dřívějším
+během, např. před a po změně:
+    python benchmarks/suite.py --output pred.json
+    ... změna ...
+    python benchmarks/suite.py --compare pred.json
+
+--tree měří jiný checkout (např. git worktree starší revize) stejnou sadou.
+Spuštění z kořene repozitáře:
+    python benchmarks/suite.py [--channels 200] [--thumbnails 50] [--repeat 3]
+                               [--latency 0.05] [--error-rate 0] [--no-304]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.fixtures import channel_id, serve_feeds, video_id, youtube_feed_xml  # noqa: E402
+
+REFRESH_TIMEOUT = 300.0
+THUMBNAIL_SIZE = (640, 410)
+
+# název -> (popis, jednotka, lepší je "lower"/"higher")
+METRICS = {
+    "startup_cold_ms": ("start, všechny kanály ze sítě", "ms", "lower"),
+    "startup_warm_ms": ("start, všechny kanály z úložiště", "ms", "lower"),
+    "refresh_200_per_s": ("obnova, změněné feedy", "kanálů/s", "higher"),
+    "refresh_304_per_s": ("obnova, nezměněné feedy (304)", "kanálů/s", "higher"),
+    "parse_ms_per_feed": ("parsování feedu", "ms", "lower"),
+    "thumbnail_cold_ms": ("náhled ze sítě (medián)", "ms", "lower"),
+    "thumbnail_cold_p90_ms": ("náhled ze sítě (p90)", "ms", "lower"),
+    "thumbnail_warm_ms": ("náhled z disku (medián)", "ms", "lower"),
+    "peak_rss_mb": ("max. paměť jádra (RSS)", "MB", "lower"),
+}
+
+
+def peak_rss_mb():
+    try:
+        import resource
+    except ImportError:
+        return None  # Windows
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux vrací kB, macOS bajty
+    return peak / 1024 / (1024 if sys.platform == "darwin" else 1)
+
+
+def refresh(core, rss_url):
+    """Obnova všech kanálů; vrací (sekundy, počet stažených kanálů, {stav: počet})
+
+    Kanály v odkladu po selhání (channel_health) refresh_all přeskočí.
+    """
+    import feed_fetcher
+
+    feed_fetcher.RSS_URL = rss_url
+    statuses = {}
+    expected = [None]
+    lock = threading.Lock()
+    done = threading.Event()
+
+    def check():
+        if expected[0] is not None and sum(statuses.values()) >= expected[0]:
+            done.set()
+
+    def on_feed(channel_name, channel_id, feed):
+        core.apply_feed(channel_name, channel_id, feed)
+        status = "chyba" if feed is None or not feed.entries else str(feed.get("status"))
+        with lock:
+            statuses[status] = statuses.get(status, 0) + 1
+            check()
+
+    core.callback = on_feed
+    start = time.perf_counter()
+    fetched = len(core.refresh_all())
+    with lock:
+        expected[0] = fetched
+        check()
+    if not done.wait(REFRESH_TIMEOUT):
+        raise SystemExit(f"obnova nedoběhla do {REFRESH_TIMEOUT:.0f} s: {statuses}")
+    return time.perf_counter() - start, fetched, statuses
+
+
+def core_child(rss_url, channels):
+    """Jádro bez GUI: studený start, obnovy, teplý start a parsování"""
+    start = time.perf_counter()
+    import feed_fetcher
+    from reader_core import ReaderCore
+
+    result = {}
+    core = ReaderCore()
+    core.load_channels()
+    _, _, statuses = refresh(core, rss_url)
+    result["startup_cold_ms"] = (time.perf_counter() - start) * 1000
+    result["statuses_cold"] = statuses
+    # Druhá generace feedu má u každého kanálu nové video
+    elapsed, fetched, statuses = refresh(core, rss_url + "&generation=1")
+    result["refresh_200_per_s"] = fetched / elapsed
+    result["statuses_200"] = statuses
+    core.shutdown(wait=True)
+
+    start = time.perf_counter()
+    core = ReaderCore()
+    core.load_channels()
+    result["startup_warm_ms"] = (time.perf_counter() - start) * 1000
+    elapsed, fetched, statuses = refresh(core, rss_url + "&generation=1")
+    result["refresh_304_per_s"] = fetched / elapsed
+    result["statuses_304"] = statuses
+    core.shutdown(wait=True)
+
+    feeds = [youtube_feed_xml(i) for i in range(1, channels + 1)]
+    start = time.perf_counter()
+    for data in feeds:
+        feed_fetcher.parse_feed(data)
+    result["parse_ms_per_feed"] = (time.perf_counter() - start) * 1000 / len(feeds)
+    result["peak_rss_mb"] = peak_rss_mb()
+    return result
+
+
+def thumbnail_child(base_url, count):
+    """Načtení náhledu jako v GUI (stažení, dekódování, zmenšení) bez a s diskovou cache"""
+    import http_client
+    from thumbnail_cache import ThumbnailCache
+    from thumbnail_loader import ThumbnailLoader
+
+    def download(url):
+        return http_client.get(url).content
+
+    loader = ThumbnailLoader(ThumbnailCache(), download)
+    urls = [f"{base_url}/vi/{video_id(i, 0)}/hqdefault.jpg" for i in range(1, count + 1)]
+
+    def latencies():
+        values = []
+        for url in urls:
+            start = time.perf_counter()
+            if loader.read_image(url, *THUMBNAIL_SIZE, lambda: True) is None:
+                raise SystemExit(f"náhled {url} se nenačetl")
+            values.append((time.perf_counter() - start) * 1000)
+        return values
+
+    cold = latencies()
+    warm = latencies()
+    loader.shutdown()
+    return {
+        "thumbnail_cold_ms": statistics.median(cold),
+        "thumbnail_cold_p90_ms": statistics.quantiles(cold, n=10)[-1] if len(cold) > 1 else cold[0],
+        "thumbnail_warm_ms": statistics.median(warm),
+    }
+
+
+def child(args):
+    mode, tree, url, count = args
+    sys.path.insert(0, os.path.abspath(tree))
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    result = core_child(url, int(count)) if mode == "core" else thumbnail_child(url, int(count))
+    print(json.dumps(result))
+
+
+def run_child(mode, tree, url, count):
+    with tempfile.TemporaryDirectory() as workdir:
+        if mode == "core":
+            channels = {f"Kanál {i}": channel_id(i) for i in range(1, count + 1)}
+            with open(os.path.join(workdir, "RSS_channels.json"), "w", encoding="utf-8") as f:
+                json.dump(channels, f, ensure_ascii=False)
+        output = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--child", mode, tree, url, str(count)],
+            cwd=workdir, capture_output=True, text=True,
+        )
+    if output.returncode != 0:
+        raise SystemExit(f"měření {mode} selhalo:\n{output.stderr}")
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def medians(runs):
+    result = {}
+    for name in METRICS:
+        values = [run[name] for run in runs if run.get(name) is not None]
+        if values:
+            result[name] = statistics.median(values)
+    return result
+
+
+def report(metrics, baseline=None):
+    for name, (label, unit, better) in METRICS.items():
+        if name not in metrics:
+            continue
+        line = f"  {label:>34}: {metrics[name]:9.2f} {unit}"
+        if baseline and baseline.get(name):
+            change = metrics[name] / baseline[name] - 1
+            improved = change < 0 if better == "lower" else change > 0
+            verdict = "lepší" if improved else "horší"
+            line += f"   před {baseline[name]:9.2f}  {change:+7.1%} {verdict if abs(change) >= 0.05 else ''}"
+        print(line.rstrip())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--channels", type=int, default=200)
+    parser.add_argument("--thumbnails", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.05, help="zpoždění odpovědi serveru v sekundách")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="podíl kanálů, jejichž feed vrací chybu")
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--no-304", action="store_true", help="server neodpovídá 304 Not Modified")
+    parser.add_argument("--tree", default=ROOT, help="měřený checkout (výchozí je tento repozitář)")
+    parser.add_argument("--output", help="uložení výsledků jako JSON")
+    parser.add_argument("--compare", help="JSON s výsledky dřívějšího běhu")
+    parser.add_argument("--child", nargs=4, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(args.child)
+        return
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+    server, rss_url = serve_feeds(
+        latency=args.latency, error_rate=args.error_rate,
+        error_status=args.error_status, not_modified=not args.no_304,
+    )
+    runs = []
+    for _ in range(args.repeat):
+        run = run_child("core", args.tree, rss_url, args.channels)
+        if args.thumbnails:
+            run.update(run_child("thumbnails", args.tree, server.base_url, args.thumbnails))
+        runs.append(run)
+    server.shutdown()
+
+    metrics = medians(runs)
+    config = {
+        "tree": os.path.abspath(args.tree), "channels": args.channels, "thumbnails": args.thumbnails,
+        "repeat": args.repeat, "latency": args.latency, "error_rate": args.error_rate,
+        "error_status": args.error_status, "not_modified": not args.no_304,
+    }
+    print(f"{args.channels} kanálů, {args.thumbnails} náhledů, {args.repeat} opakování, "
+          f"zpoždění {args.latency * 1000:.0f} ms, chyby {args.error_rate:.0%}"
+          f"{'' if config['not_modified'] else ', bez 304'}")
+    if baseline:
+        differs = [key for key, value in config.items() if key != "tree" and baseline["config"].get(key) != value]
+        if differs:
+            print(f"  pozor, srovnávaný běh měl jiné nastavení: {', '.join(differs)}")
+    report(metrics, baseline and baseline["metrics"])
+    print(f"  odpovědi serveru: {server.counts}")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"config": config, "metrics": metrics, "runs": runs}, f, ensure_ascii=False, indent=4)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Stav dostupnosti kanálů: počítání selhání, exponenciální odklad a jistič
+
+Každé selhání stažení posune další pokus o BACKOFF_BASE * 2^(n-1) sekund
+(nejvýš BACKOFF_MAX). Po OPEN_AFTER selháních za sebou je kanál "nedostupný"
+(jistič rozpojen) a zkouší se jen jedním požadavkem po uplynutí odkladu;
+první úspěch stav vynuluje. Stav se ukládá do EntryStore, takže mrtvý kanál
+se po restartu nestahuje znovu hned při startu.
+"""
+import threading
+import time
+
+BACKOFF_BASE = 5 * 60        # s, odklad po prvním selhání
+BACKOFF_MAX = 24 * 3600      # s, nejdelší odklad
+OPEN_AFTER = 5               # selhání za sebou, po kterých je kanál nedostupný
+
+# Stavy kanálu
+OK = "ok"
+STALE = "stale"      # poslední stažení selhalo, zobrazují se uložená videa
+BROKEN = "broken"    # jistič rozpojen
+
+
+def backoff(failures):
+    """Odklad dalšího pokusu po daném počtu selhání za sebou"""
+    return min(BACKOFF_MAX, BACKOFF_BASE * 2 ** (failures - 1))
+
+
+class ChannelHealth:
+    """Selhání kanálů podle channel_id s trvalým uložením v EntryStore"""
+
+    def __init__(self, store, open_after=OPEN_AFTER):
+        self.store = store
+        self.open_after = open_after
+        self.failures = {}  # channel_id -> (počet, další pokus, poslední chyba, čas selhání)
+        self.lock = threading.Lock()
+
+    def load(self):
+        failures = self.store.load_failures()
+        with self.lock:
+            self.failures = failures
+
+    def failure(self, channel_id, error, now=None):
+        """Zaznamená selhání; vrací odklad do dalšího pokusu v sekundách"""
+        now = time.time() if now is None else now
+        with self.lock:
+            count = self.failures[channel_id][0] + 1 if channel_id in self.failures else 1
+            delay = backoff(count)
+            record = self.failures[channel_id] = (count, now + delay, str(error), now)
+        try:
+            self.store.save_failure(channel_id, *record)
+        except Exception as e:
+            print(f"Chyba při ukládání stavu kanálu: {e}")
+        return delay
+
+    def success(self, channel_id):
+        with self.lock:
+            if self.failures.pop(channel_id, None) is None:
+                return
+        try:
+            self.store.clear_failure(channel_id)
+        except Exception as e:
+            print(f"Chyba při ukládání stavu kanálu: {e}")
+
+    def retry_delay(self, channel_id, now=None):
+        """Kolik sekund zbývá do dalšího povoleného pokusu (0 = stáhnout hned)"""
+        with self.lock:
+            record = self.failures.get(channel_id)
+        if record is None:
+            return 0
+        now = time.time() if now is None else now
+        return max(0.0, record[1] - now)
+
+    def state(self, channel_id):
+        """(stav, popis) pro zobrazení v seznamu kanálů"""
+        with self.lock:
+            record = self.failures.get(channel_id)
+        if record is None:
+            return OK, ""
+        count, retry_at, last_error, _ = record
+        retry = time.strftime("%d.%m. %H:%M", time.localtime(retry_at))
+        message = f"{count}x nepodařilo načíst ({last_error}), další pokus {retry}"
+        return (BROKEN if count >= self.open_after else STALE), message
@@ -0,0 +1,121 @@
+"""Trvalý seznam odebíraných kanálů (název -> UC ID)
+
+RSS_channels.json je snímek, změny se mezi snímky jen připisují do deníku
+(jeden řádek JSON na operaci), takže úprava stojí O(1) místo přepsání celého
+souboru. Zápisy se shlukují (FLUSH_DELAY), snímek se zapisuje atomicky
+přes dočasný soubor a po COMPACT_AFTER operacích se deník do snímku sloučí.
+Při načtení se na snímek přehraje deník; neúplný poslední řádek po pádu
+se ignoruje a přehrání je idempotentní.
+"""
+import json
+import os
+import threading
+
+from instrumentation import error, timed
+
+CHANNELS_FILE = "RSS_channels.json"
+
+FLUSH_DELAY = 0.5      # s, shluk změn (např. hromadný import) = jeden zápis
+COMPACT_AFTER = 1000   # operací v deníku před sloučením do snímku
+
+
+class ChannelJournal:
+    def __init__(self, path=CHANNELS_FILE, flush_delay=FLUSH_DELAY, compact_after=COMPACT_AFTER):
+        self.path = path
+        self.journal_path = path + ".journal"
+        self.flush_delay = flush_delay
+        self.compact_after = compact_after
+        self.channels = {}
+        self.pending = []       # operace čekající na zápis
+        self.journal_size = 0   # operací v deníku od posledního snímku
+        self.timer = None
+        self.lock = threading.RLock()
+
+    def load(self):
+        """Načte snímek a přehraje deník; vrací kopii název -> UC ID"""
+        with self.lock:
+            self.channels = {}
+            if os.path.exists(self.path):
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self.channels = json.load(f)
+            self.journal_size = 0
+            if os.path.exists(self.journal_path):
+                with open(self.journal_path, "r", encoding="utf-8") as f:
+                    for line in f:
+                        try:
+                            self.apply(json.loads(line))
+                        except (ValueError, KeyError):
+                            continue  # neúplný řádek po přerušeném zápisu
+                        self.journal_size += 1
+            return dict(self.channels)
+
+    def apply(self, op):
+        if op["op"] == "add":
+            self.channels[op["name"]] = op["id"]
+        elif op["op"] == "remove":
+            self.channels.pop(op["name"], None)
+
+    def add(self, name, channel_id):
+        with self.lock:
+            if self.channels.get(name) != channel_id:
+                self.record({"op": "add", "name": name, "id": channel_id})
+
+    def remove(self, name):
+        with self.lock:
+            if name in self.channels:
+                self.record({"op": "remove", "name": name})
+
+    def record(self, op):
+        self.apply(op)
+        self.pending.append(op)
+        if self.timer is None:
+            self.timer = threading.Timer(self.flush_delay, self.flush)
+            self.timer.daemon = True
+            self.timer.start()
+
+    def flush(self):
+        """Připíše čekající operace do deníku (fsync), případně ho sloučí do snímku"""
+        with self.lock:
+            if self.timer is not None:
+                self.timer.cancel()
+                self.timer = None
+            if not self.pending:
+                return
+            try:
+                if self.journal_size + len(self.pending) >= self.compact_after:
+                    self.compact()
+                else:
+                    with timed("journal_write"), open(self.journal_path, "a", encoding="utf-8") as f:
+                        f.write("".join(json.dumps(op, ensure_ascii=False) + "\n" for op in self.pending))
+                        f.flush()
+                        os.fsync(f.fileno())
+                    self.journal_size += len(self.pending)
+                self.pending = []
+            except Exception as e:
+                print(f"Chyba při ukládání kanálů: {e}")
+                error("journal_write", e)
+
+    def compact(self):
+        """Atomický zápis snímku a vyprázdnění deníku"""
+        with self.lock, timed("journal_compact"):
+            tmp = self.path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self.channels, f, ensure_ascii=False, indent=4)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.path)
+            # Pád před vyprázdněním deníku nevadí, přehrání na novém snímku nic nezmění
+            if os.path.exists(self.journal_path):
+                os.remove(self.journal_path)
+            self.journal_size = 0
+
+    def close(self):
+        """Zapíše vše čekající a sloučí deník do snímku"""
+        with self.lock:
+            self.flush()
+            if self.journal_size:
+                try:
+                    self.compact()
+                except Exception as e:
+                    print(f"Chyba při ukládání kanálů: {e}")
+                    error("journal_compact", e)
@@ -0,0 +1,120 @@
+"""Převod URL kanálů a @handle na UC ID
+
+Stránka kanálu se čte proudově a stahování skončí u první značky s ID
+(canonical odkaz je hned v <head>), takže se nestahuje celé HTML.
+Vyřešené handle a URL se ukládají do HANDLE_CACHE_FILE.
+"""
+import json
+import os
+import re
+import threading
+import time
+
+import http_client
+from instrumentation import error, timed
+
+HANDLE_CACHE_FILE = "RSS_handles.json"
+
+CHUNK_SIZE = 16 * 1024
+MAX_PAGE_BYTES = 4 * 1024 * 1024  # bez nalezené značky se čtení ukončí i tak
+OVERLAP = 256                     # konec předchozího bloku pro značku na hranici bloků
+LOOKUP_DEADLINE = 20.0            # s, celé zjištění ID ze stránky včetně opakování
+
+CHANNEL_ID = re.compile(r"^UC[\w-]{22}$")
+CHANNEL_URL = re.compile(r"youtube\.com/channel/(UC[\w-]{22})")
+HANDLE_URL = re.compile(r"youtube\.com/(@[\w.-]+)")
+HANDLE = re.compile(r"^(@[\w.-]+)$")
+CHANNEL_ID_MARKERS = re.compile(
+    rb'<link rel="canonical" href="https://www\.youtube\.com/channel/(UC[\w-]+)"'
+    rb'|<meta\s+itemprop="channelId"\s+content="(UC[\w-]+)"'
+    rb'|<meta\s+property="og:url"\s+content="https://www\.youtube\.com/channel/(UC[\w-]+)"'
+    rb'|"channelId":"(UC[\w-]+)"'
+)
+
+
+def channel_refs(text):
+    """Jednotlivé odkazy na kanály z vloženého textu (oddělené mezerami, čárkami nebo řádky)"""
+    return list(dict.fromkeys(ref for ref in re.split(r"[\s,;]+", text) if ref))
+
+
+def extract_channel_id(url):
+    """Extrahování ID kanálu ze stránky; čte se jen do první značky s ID"""
+    try:
+        headers = {"User-Agent": "Mozilla/5.0"}
+        end = time.monotonic() + LOOKUP_DEADLINE
+        with timed("channel_lookup"), http_client.get(url, headers=headers, stream=True, deadline=end) as response:
+            if response.status_code != 200:
+                return None
+            tail = b""
+            read = 0
+            for chunk in response.iter_content(CHUNK_SIZE):
+                buffer = tail + chunk
+                match = CHANNEL_ID_MARKERS.search(buffer)
+                if match:
+                    return next(group for group in match.groups() if group).decode()
+                read += len(chunk)
+                if read >= MAX_PAGE_BYTES or time.monotonic() > end:
+                    break
+                tail = buffer[-OVERLAP:]
+        return None
+    except Exception as e:
+        print(f"Chyba při získávání channel_id:", e)
+        error("channel_lookup", e)
+        return None
+
+
+class ChannelResolver:
+    """Převod UC ID, URL kanálu nebo @handle na UC ID s trvalou cache"""
+
+    def __init__(self, path=HANDLE_CACHE_FILE):
+        self.path = path
+        self.lock = threading.Lock()
+        self.cache = {}
+        try:
+            if os.path.exists(path):
+                with open(path, "r", encoding="utf-8") as f:
+                    self.cache = json.load(f)
+        except Exception as e:
+            print(f"Chyba při načítání cache handle: {e}")
+
+    def lookup(self, ref):
+        """(UC ID nebo None, klíč cache a URL ke stažení)"""
+        if CHANNEL_ID.match(ref):
+            return ref, None, None
+        match = CHANNEL_URL.search(ref)
+        if match:
+            return match.group(1), None, None
+        match = HANDLE_URL.search(ref) or HANDLE.match(ref)
+        if match:
+            handle = match.group(1)
+            key = handle.lower()
+            url = f"https://www.youtube.com/{handle}"
+        elif "youtube.com/" in ref or "youtu.be/" in ref:
+            url = ref if "://" in ref else "https://" + ref
+            key = url.split("://", 1)[1].removeprefix("www.").rstrip("/")
+        else:
+            return None, None, None
+        with self.lock:
+            return self.cache.get(key), key, url
+
+    def resolve(self, ref):
+        """UC ID pro odkaz, nebo None, pokud ho nejde zjistit"""
+        channel_id, key, url = self.lookup(ref)
+        if channel_id is not None or url is None:
+            return channel_id
+        channel_id = extract_channel_id(url)
+        if channel_id is not None:
+            self.remember(key, channel_id)
+        return channel_id
+
+    def remember(self, key, channel_id):
+        with self.lock:
+            self.cache[key] = channel_id
+            try:
+                tmp = self.path + ".tmp"
+                with open(tmp, "w", encoding="utf-8") as f:
+                    json.dump(self.cache, f, ensure_ascii=False, indent=4)
+                os.replace(tmp, self.path)
+            except Exception as e:
+                print(f"Chyba při ukládání cache handle: {e}")
+                error("handle_cache_write", e)
@@ -0,0 +1,110 @@
+"""Ladicí panel s měřeními z instrumentation.py (otevírá se klávesou F12)"""
+import json
+
+from PyQt5.QtCore import QTimer
+from PyQt5.QtGui import QFontDatabase
+from PyQt5.QtWidgets import QDialog, QFileDialog, QHBoxLayout, QPlainTextEdit, QPushButton, QVBoxLayout
+
+from instrumentation import metrics
+
+REFRESH_MS = 1000
+CHANNEL_ROWS = 30  # kanály s nejdelším celkovým stahováním
+ERROR_ROWS = 10
+
+
+def format_snapshot(snapshot, names=None):
+    """Souhrn měření jako text s tabulkami; names převádí ID kanálu na název"""
+    names = names or {}
+    lines = [f"Doba běhu: {snapshot['uptime']:.0f} s", "", "Operace                 počet   průměr      p50      p90      max  [ms]"]
+    for name, stats in snapshot["operations"].items():
+        lines.append(
+            f"{name:<22} {stats['count']:>6} {stats['mean'] * 1000:>8.1f} {stats['p50'] * 1000:>8.1f}"
+            f" {stats['p90'] * 1000:>8.1f} {stats['max'] * 1000:>8.1f}"
+        )
+    if snapshot["errors"]:
+        lines += ["", "Chyby"]
+        lines += [f"{name:<22} {value:>6}" for name, value in sorted(snapshot["errors"].items())]
+    if snapshot["counters"]:
+        # Počítadla bez kanálu, např. zásahy cache náhledů
+        lines += ["", "Počítadla"]
+        lines += [f"{name:<24} {value:>8}" for name, value in snapshot["counters"].items()]
+
+    channels = sorted(
+        snapshot["channels"].items(),
+        key=lambda item: item[1].get("feed_download", {}).get("sum", 0.0),
+        reverse=True,
+    )
+    lines += ["", "Kanál                           stažení   200   304  chyby      kB  stažení ms  parsování ms"]
+    for channel_id, stats in channels[:CHANNEL_ROWS]:
+        download = stats.get("feed_download", {})
+        parse = stats.get("feed_parse", {})
+        lines.append(
+            f"{names.get(channel_id, channel_id)[:30]:<30} {stats.get('fetches', 0):>8} {stats.get('http_200', 0):>5}"
+            f" {stats.get('http_304', 0):>5} {stats.get('errors', 0):>6} {stats.get('bytes', 0) / 1024:>7.0f}"
+            f" {download.get('mean', 0.0) * 1000:>11.1f} {parse.get('mean', 0.0) * 1000:>13.1f}"
+        )
+    if len(channels) > CHANNEL_ROWS:
+        lines.append(f"... a dalších {len(channels) - CHANNEL_ROWS} kanálů (celý výpis v JSON)")
+
+    if snapshot["recent_errors"]:
+        lines += ["", "Poslední chyby"]
+        for record in snapshot["recent_errors"][-ERROR_ROWS:]:
+            channel = names.get(record["channel"], record["channel"]) or ""
+            lines.append(f"{record['operation']} {channel}: {record['error']}")
+    return "\n".join(lines)
+
+
+class DebugPanel(QDialog):
+    """Okno s průběžně obnovovaným souhrnem měření a uložením do JSON"""
+
+    def __init__(self, subscriptions, parent=None):
+        super().__init__(parent)
+        self.subscriptions = subscriptions  # funkce vracející název -> ID kanálu
+        self.setWindowTitle("Ladění: měření")
+        self.resize(900, 600)
+        layout = QVBoxLayout(self)
+        self.text = QPlainTextEdit()
+        self.text.setReadOnly(True)
+        self.text.setFont(QFontDatabase.systemFont(QFontDatabase.FixedFont))
+        layout.addWidget(self.text)
+        buttons = QHBoxLayout()
+        layout.addLayout(buttons)
+        save_btn = QPushButton("Uložit JSON")
+        save_btn.clicked.connect(self.save_json)
+        buttons.addWidget(save_btn)
+        reset_btn = QPushButton("Vynulovat")
+        reset_btn.clicked.connect(self.reset)
+        buttons.addWidget(reset_btn)
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.refresh)
+
+    def showEvent(self, event):
+        self.refresh()
+        self.timer.start(REFRESH_MS)
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        self.timer.stop()
+        super().hideEvent(event)
+
+    def refresh(self):
+        names = {channel_id: name for name, channel_id in self.subscriptions().items()}
+        scroll = self.text.verticalScrollBar().value()
+        self.text.setPlainText(format_snapshot(metrics.snapshot(), names))
+        self.text.verticalScrollBar().setValue(scroll)
+
+    def reset(self):
+        metrics.reset()
+        self.refresh()
+
+    def save_json(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Uložit měření", "metrics.json", "JSON (*.json)")
+        if not path:
+            return
+        snapshot = metrics.snapshot()
+        snapshot["names"] = {channel_id: name for name, channel_id in self.subscriptions().items()}
+        try:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(snapshot, f, ensure_ascii=False, indent=4)
+        except OSError as e:
+            print(f"Chyba při ukládání měření: {e}")
@@ -0,0 +1,294 @@
+import sqlite3
+import threading
+import time
+
+from video import Video
+
+STORE_FILE = "RSS_store.db"
+
+# Archiv videí, která už vypadla z feedu (YouTube vrací jen ~15 posledních)
+ARCHIVE_MAX_VIDEOS = 2000   # nejvýš videí na kanál včetně aktuálního feedu (None = bez limitu)
+ARCHIVE_MAX_AGE = None      # s, starší videa z archivu se mažou (None = bez limitu)
+ARCHIVED = -1               # position videa, které už ve feedu není
+VACUUM_FREE_RATIO = 0.25    # compact() zmenší soubor, je-li volná víc než čtvrtina stránek
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS channels (
+    id TEXT PRIMARY KEY,
+    title TEXT,
+    etag TEXT,
+    modified TEXT,
+    updated REAL
+);
+CREATE TABLE IF NOT EXISTS videos (
+    video_id TEXT PRIMARY KEY,
+    channel_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    title TEXT,
+    published TEXT,
+    published_ts REAL,
+    summary TEXT,
+    link TEXT,
+    thumbnail TEXT
+);
+CREATE INDEX IF NOT EXISTS videos_channel ON videos (channel_id, position);
+CREATE TABLE IF NOT EXISTS failures (
+    channel_id TEXT PRIMARY KEY,
+    failures INTEGER NOT NULL,
+    retry_at REAL NOT NULL,
+    last_error TEXT,
+    last_failure REAL
+);
+"""
+
+# Fulltextový index nad názvy a popisy videí, udržovaný triggery při každém zápisu
+SEARCH_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS videos_fts USING fts5 (
+    title, summary, content='videos', content_rowid='rowid', tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS videos_fts_insert AFTER INSERT ON videos BEGIN
+    INSERT INTO videos_fts (rowid, title, summary) VALUES (new.rowid, new.title, new.summary);
+END;
+CREATE TRIGGER IF NOT EXISTS videos_fts_delete AFTER DELETE ON videos BEGIN
+    INSERT INTO videos_fts (videos_fts, rowid, title, summary) VALUES ('delete', old.rowid, old.title, old.summary);
+END;
+DROP TRIGGER IF EXISTS videos_fts_update;
+CREATE TRIGGER videos_fts_update AFTER UPDATE ON videos
+WHEN old.title IS NOT new.title OR old.summary IS NOT new.summary BEGIN
+    INSERT INTO videos_fts (videos_fts, rowid, title, summary) VALUES ('delete', old.rowid, old.title, old.summary);
+    INSERT INTO videos_fts (rowid, title, summary) VALUES (new.rowid, new.title, new.summary);
+END;
+"""
+
+SEARCH_LIMIT = 200
+TITLE_WEIGHT = 10.0  # shoda v názvu má při řazení větší váhu než v popisu
+
+VIDEO_COLUMNS = "video_id, title, published, published_ts, summary, link, thumbnail"
+
+
+class EntryStore:
+    """Lokální SQLite úložiště kanálů a videí (klíčem je yt:videoId)
+
+    Slouží zároveň jako cache validátorů pro podmíněné požadavky
+    (viz feed_fetcher.fetch_feed), takže odpověď 304 se obslouží z disku.
+    Videa, která z feedu vypadnou, zůstávají v archivu (position = ARCHIVED)
+    do limitu max_videos na kanál a stáří max_age; do paměti se při startu
+    načítá jen aktuální feed.
+    """
+
+    def __init__(self, path=STORE_FILE, max_videos=ARCHIVE_MAX_VIDEOS, max_age=ARCHIVE_MAX_AGE):
+        self.max_videos = max_videos
+        self.max_age = max_age
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        columns = [row[1] for row in self.conn.execute("PRAGMA table_info(videos)")]
+        if "published_ts" not in columns:
+            self.conn.execute("ALTER TABLE videos ADD COLUMN published_ts REAL")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS videos_archive ON videos (channel_id, published_ts)")
+        # INSERT OR REPLACE musí spouštět i mazací trigger fulltextového indexu
+        self.conn.execute("PRAGMA recursive_triggers=ON")
+        has_index = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'videos_fts'"
+        ).fetchone()
+        self.conn.executescript(SEARCH_SCHEMA)
+        if not has_index:
+            self.conn.execute("INSERT INTO videos_fts (videos_fts) VALUES ('rebuild')")
+            self.conn.commit()
+        has_watched = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'watched'"
+        ).fetchone()
+        if not has_watched:
+            # Videa uložená před zavedením stavu zhlédnutí se berou jako zhlédnutá
+            with self.conn:
+                self.conn.execute("CREATE TABLE watched (video_id TEXT PRIMARY KEY, watched_at REAL)")
+                self.conn.execute("INSERT INTO watched SELECT video_id, ? FROM videos", (time.time(),))
+
+    def load_all(self):
+        """Načte videa aktuálních feedů všech kanálů (bez archivu): channel_id -> [entries]"""
+        result = {}
+        with self.lock:
+            rows = self.conn.execute(
+                f"SELECT channel_id, {VIDEO_COLUMNS} FROM videos WHERE position >= 0 ORDER BY channel_id, position"
+            ).fetchall()
+        for row in rows:
+            result.setdefault(row[0], []).append(Video(*row[1:]))
+        return result
+
+    def validators(self, channel_id):
+        """Vrátí (etag, modified) pro podmíněný požadavek"""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT etag, modified FROM channels WHERE id = ?", (channel_id,)
+            ).fetchone()
+        return row if row else (None, None)
+
+    def cached_feed(self, channel_id):
+        """Sestaví feed z uložených záznamů (pro odpověď 304) bez parsování XML"""
+        with self.lock:
+            channel = self.conn.execute(
+                "SELECT title FROM channels WHERE id = ?", (channel_id,)
+            ).fetchone()
+            rows = self.conn.execute(
+                f"SELECT {VIDEO_COLUMNS} FROM videos WHERE channel_id = ? AND position >= 0 ORDER BY position",
+                (channel_id,),
+            ).fetchall()
+        if channel is None or not rows:
+            return None
+        import feedparser
+
+        return feedparser.FeedParserDict(
+            status=304,
+            feed=feedparser.FeedParserDict(title=channel[0] or channel_id),
+            entries=[Video(*row) for row in rows],
+        )
+
+    def archived(self, channel_id):
+        """Videa kanálu, která už nejsou ve feedu, od nejnovějšího"""
+        with self.lock:
+            rows = self.conn.execute(
+                f"SELECT {VIDEO_COLUMNS} FROM videos WHERE channel_id = ? AND position < 0 "
+                "ORDER BY published_ts DESC",
+                (channel_id,),
+            ).fetchall()
+        return [Video(*row) for row in rows]
+
+    def update(self, channel_id, feed):
+        """Sloučí čerstvě stažený feed s uloženými videi kanálu
+
+        Videa se párují podle yt:videoId: změněný název či popis se přepíše
+        na místě, videa mimo nový feed přejdou do archivu a archiv se ořízne
+        podle max_videos a max_age.
+        """
+        rows = [
+            (video.video_id, channel_id, position, video.title, video.published,
+             video.published_ts, video.summary, video.link, video.thumbnail)
+            for position, video in enumerate(feed.entries)
+        ]
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO channels (id, title, etag, modified, updated) VALUES (?, ?, ?, ?, ?)",
+                (channel_id, feed.feed.get("title", channel_id), feed.get("etag"), feed.get("modified"), time.time()),
+            )
+            # Do archivu jdou jen videa, která v novém feedu nejsou
+            placeholders = ", ".join("?" * len(rows))
+            self.conn.execute(
+                f"UPDATE videos SET position = ? WHERE channel_id = ? AND position >= 0 "
+                f"AND video_id NOT IN ({placeholders})",
+                (ARCHIVED, channel_id, *(row[0] for row in rows)),
+            )
+            # Nezměněné řádky se nepřepisují, fulltext se obnoví jen při změně názvu či popisu
+            self.conn.executemany(
+                "INSERT INTO videos "
+                "(video_id, channel_id, position, title, published, published_ts, summary, link, thumbnail) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (video_id) DO UPDATE SET channel_id = excluded.channel_id, "
+                "position = excluded.position, title = excluded.title, published = excluded.published, "
+                "published_ts = excluded.published_ts, summary = excluded.summary, "
+                "link = excluded.link, thumbnail = excluded.thumbnail "
+                "WHERE (channel_id, position, title, published, published_ts, summary, link, thumbnail) "
+                "IS NOT (excluded.channel_id, excluded.position, excluded.title, excluded.published, "
+                "excluded.published_ts, excluded.summary, excluded.link, excluded.thumbnail)",
+                rows,
+            )
+            self.prune_locked(channel_id, time.time())
+
+    def prune_locked(self, channel_id, now):
+        """Smaže archivovaná videa kanálu nad limit počtu a stáří; vrací počet smazaných"""
+        deleted = 0
+        if self.max_age is not None:
+            deleted += self.conn.execute(
+                "DELETE FROM videos WHERE channel_id = ? AND position < 0 AND published_ts < ?",
+                (channel_id, now - self.max_age),
+            ).rowcount
+        if self.max_videos is not None:
+            current = self.conn.execute(
+                "SELECT COUNT(*) FROM videos WHERE channel_id = ? AND position >= 0", (channel_id,)
+            ).fetchone()[0]
+            deleted += self.conn.execute(
+                "DELETE FROM videos WHERE rowid IN ("
+                "SELECT rowid FROM videos WHERE channel_id = ? AND position < 0 "
+                "ORDER BY published_ts DESC LIMIT -1 OFFSET ?)",
+                (channel_id, max(0, self.max_videos - current)),
+            ).rowcount
+        return deleted
+
+    def compact(self):
+        """Uplatní limity archivu na všechny kanály a zmenší fulltext i soubor databáze
+
+        Zapomene i stav zhlédnutí smazaných videí; vrací počet smazaných videí.
+        """
+        now = time.time()
+        with self.lock:
+            channel_ids = [row[0] for row in self.conn.execute("SELECT DISTINCT channel_id FROM videos")]
+            deleted = 0
+            for channel_id in channel_ids:
+                with self.conn:
+                    deleted += self.prune_locked(channel_id, now)
+            with self.conn:
+                self.conn.execute("DELETE FROM watched WHERE video_id NOT IN (SELECT video_id FROM videos)")
+                self.conn.execute("INSERT INTO videos_fts (videos_fts) VALUES ('optimize')")
+            free = self.conn.execute("PRAGMA freelist_count").fetchone()[0]
+            pages = self.conn.execute("PRAGMA page_count").fetchone()[0]
+            if pages and free / pages > VACUUM_FREE_RATIO:
+                self.conn.execute("VACUUM")
+            self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        return deleted
+
+    def discard(self, channel_id):
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM videos WHERE channel_id = ?", (channel_id,))
+            self.conn.execute("DELETE FROM channels WHERE id = ?", (channel_id,))
+            self.conn.execute("DELETE FROM failures WHERE channel_id = ?", (channel_id,))
+
+    def load_watched(self):
+        """Množina videoId zhlédnutých videí"""
+        with self.lock:
+            return {row[0] for row in self.conn.execute("SELECT video_id FROM watched")}
+
+    def save_watched(self, video_id, watched_at):
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO watched (video_id, watched_at) VALUES (?, ?)", (video_id, watched_at)
+            )
+
+    def load_failures(self):
+        """Selhávající kanály: channel_id -> (počet selhání, další pokus, poslední chyba, čas selhání)"""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT channel_id, failures, retry_at, last_error, last_failure FROM failures"
+            ).fetchall()
+        return {row[0]: row[1:] for row in rows}
+
+    def save_failure(self, channel_id, failures, retry_at, last_error, last_failure):
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO failures (channel_id, failures, retry_at, last_error, last_failure) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (channel_id, failures, retry_at, last_error, last_failure),
+            )
+
+    def clear_failure(self, channel_id):
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM failures WHERE channel_id = ?", (channel_id,))
+
+    def search(self, text, limit=SEARCH_LIMIT):
+        """Fulltextové hledání v názvech a popisech: [(channel_id, Video)] od nejlepší shody
+
+        Každé slovo dotazu se hledá jako prefix, takže funguje i při psaní.
+        """
+        terms = ['"' + term.replace('"', '""') + '"*' for term in text.split()]
+        if not terms:
+            return []
+        columns = ", ".join(f"v.{column.strip()}" for column in VIDEO_COLUMNS.split(","))
+        with self.lock:
+            rows = self.conn.execute(
+                f"SELECT v.channel_id, {columns} FROM videos_fts "
+                "JOIN videos v ON v.rowid = videos_fts.rowid "
+                "WHERE videos_fts MATCH ? "
+                f"ORDER BY bm25(videos_fts, {TITLE_WEIGHT}, 1.0) LIMIT ?",
+                (" ".join(terms), limit),
+            ).fetchall()
+        return [(row[0], Video(*row[1:])) for row in rows]
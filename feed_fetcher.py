@@ -0,0 +1,309 @@
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import http_client
+import youtube_feed
+from instrumentation import count, error, observe, timed
+from video import Video
+
+RSS_URL = "https://www.youtube.com/feeds/videos.xml?channel_id={}"
+
+# Maximální počet souběžně stahovaných feedů
+FETCH_WORKERS = 8
+
+# Pevný limit na stažení jednoho feedu včetně opakování; po něm se kanál hlásí jako nedostupný
+FEED_DEADLINE = 20.0
+DEADLINE_GRACE = 1.0  # hlídač navíc počká na samotné stažení, které limit hlídá i samo
+CHUNK_SIZE = 64 * 1024
+
+
+def empty_feed(status=None, error=None):
+    """Prázdný feed při chybě sítě nebo serveru (jako u feedparser.parse)"""
+    import feedparser
+
+    return feedparser.FeedParserDict(
+        status=status, bozo=1, bozo_exception=error, feed=feedparser.FeedParserDict(), entries=[]
+    )
+
+
+def parse_feed(data):
+    """Parsování feedu proudovým YouTube parserem, feedparser jen pro nestandardní dokumenty"""
+    try:
+        title, entries = youtube_feed.parse(data)
+    except youtube_feed.FeedFormatError:
+        return parse_other_feed(data)
+    return parsed_feed(title, entries)
+
+
+def parse_other_feed(data):
+    """Nestandardní feed přes feedparser; plné záznamy se hned nahradí kompaktními Video"""
+    import feedparser
+
+    feed = feedparser.parse(data)
+    feed["entries"] = [Video.from_entry(entry) for entry in feed.entries]
+    return feed
+
+
+def parsed_feed(title, entries):
+    """Feed ve tvaru výsledku feedparser.parse z výsledku youtube_feed.parse"""
+    import feedparser
+
+    channel = feedparser.FeedParserDict() if title is None else feedparser.FeedParserDict(title=title)
+    return feedparser.FeedParserDict(bozo=0, feed=channel, entries=entries)
+
+
+def read_body(response, end):
+    """Přečte tělo odpovědi; po překročení času end vyhodí requests.Timeout"""
+    import requests
+
+    chunks = []
+    for chunk in response.iter_content(CHUNK_SIZE):
+        chunks.append(chunk)
+        if time.monotonic() > end:
+            response.close()
+            raise requests.Timeout("překročen časový limit stažení feedu")
+    return b"".join(chunks)
+
+
+def fetch_feed(channel_id, store=None, deadline=FEED_DEADLINE, parse_pool=None):
+    """Stažení a parsování RSS feedu jednoho kanálu
+
+    Stahuje se přes sdílený http_client (keep-alive, timeout, opakování),
+    celé stažení včetně těla odpovědi musí skončit do deadline sekund.
+    S úložištěm (EntryStore) se posílá podmíněný požadavek (If-None-Match/If-Modified-Since),
+    při odpovědi 304 se vrátí uložené záznamy bez parsování XML a čerstvý feed se uloží.
+    feedparser a requests se importují až při prvním stažení (kvůli rychlému startu GUI).
+    S parse_pool se parsuje v procesu (vlákno na výsledek čeká).
+    """
+    feed, raw = download_feed(channel_id, store, deadline)
+    if raw is None:
+        return feed
+    with timed("feed_parse", channel_id):
+        if parse_pool is None:
+            feed = parse_feed(raw[0])
+        else:
+            try:
+                feed = parsed_feed(*parse_pool.parse(raw[0]))
+            except youtube_feed.FeedFormatError:
+                feed = parse_other_feed(raw[0])
+    return store_feed(channel_id, store, feed, raw)
+
+
+def download_feed(channel_id, store=None, deadline=FEED_DEADLINE):
+    """Stažení feedu bez parsování
+
+    Vrací (hotový feed, None) pro chybu a odpověď 304, nebo
+    (None, (bajty, etag, modified)) pro feed k parsování.
+    """
+    import requests
+
+    headers = {}
+    if store is not None:
+        etag, modified = store.validators(channel_id)
+        if etag:
+            headers["If-None-Match"] = etag
+        if modified:
+            headers["If-Modified-Since"] = modified
+    count("fetches", channel_id)
+    end = time.monotonic() + deadline
+    connect, read = http_client.client.timeout
+    try:
+        with timed("feed_download", channel_id):
+            response = http_client.get(
+                RSS_URL.format(channel_id), headers=headers,
+                timeout=(min(connect, deadline), min(read, deadline)), stream=True, deadline=end,
+            )
+            with response:
+                content = read_body(response, end)
+    except requests.RequestException as e:
+        error("feed_download", e, channel_id)
+        return empty_feed(error=e), None
+    # Doba do přijetí hlaviček: DNS, spojení, TLS a odezva serveru
+    observe("feed_response", response.elapsed.total_seconds(), channel_id)
+    count(f"http_{response.status_code}", channel_id)
+    count("bytes", channel_id, len(content))
+    if response.status_code == 304 and store is not None:
+        with timed("store_read", channel_id):
+            cached = store.cached_feed(channel_id)
+        if cached is not None:
+            return cached, None
+    if response.status_code != 200:
+        error("feed_download", f"HTTP {response.status_code}", channel_id)
+        return empty_feed(status=response.status_code), None
+    return None, (content, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+
+
+def store_feed(channel_id, store, feed, raw):
+    """Doplní validátory rozparsovaného feedu a uloží ho do úložiště"""
+    feed["status"] = 200
+    feed["etag"] = raw[1]
+    feed["modified"] = raw[2]
+    if store is not None and feed.entries:
+        with timed("store_write", channel_id):
+            store.update(channel_id, feed)
+    return feed
+
+
+class DeadlineWatch:
+    """Jedno vlákno, které po uplynutí termínu zavolá akci (pokud se termín nezrušil)"""
+
+    def __init__(self):
+        self.heap = []  # (čas, klíč, akce)
+        self.active = set()  # klíče nezrušených termínů
+        self.counter = itertools.count()
+        self.condition = threading.Condition()
+        self.thread = None
+
+    def add(self, seconds, action):
+        """Naplánuje action() za seconds sekund; vrací klíč pro cancel"""
+        with self.condition:
+            key = next(self.counter)
+            self.active.add(key)
+            heapq.heappush(self.heap, (time.monotonic() + seconds, key, action))
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.run, name="deadline", daemon=True)
+                self.thread.start()
+            self.condition.notify()
+            return key
+
+    def cancel(self, key):
+        with self.condition:
+            self.active.discard(key)
+
+    def run(self):
+        while True:
+            with self.condition:
+                while True:
+                    while self.heap and self.heap[0][1] not in self.active:
+                        heapq.heappop(self.heap)
+                    if self.heap and self.heap[0][0] <= time.monotonic():
+                        _, key, action = heapq.heappop(self.heap)
+                        self.active.discard(key)
+                        break
+                    self.condition.wait(self.heap[0][0] - time.monotonic() if self.heap else None)
+            try:
+                action()
+            except Exception as e:
+                print(f"Chyba hlídání časového limitu: {e}")
+
+
+class FeedFetcher:
+    """Souběžné stahování feedů v omezeném poolu vláken
+
+    S nastaveným parse_pool (parse_pool.ParsePool) se stažené bajty parsují
+    v procesech a vlákno stahování mezitím pokračuje dalším kanálem;
+    uložení a callback pak obstará vlákno "finish".
+    """
+
+    def __init__(self, max_workers=FETCH_WORKERS, store=None, deadline=FEED_DEADLINE):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="feed")
+        self.store = store
+        self.deadline = deadline
+        self.watch = DeadlineWatch()
+        self.parse_pool = None
+        self.finisher = None
+        self.parsing = 0  # feedy rozparsovávané v procesech nebo čekající na uložení
+        self.lock = threading.Lock()
+        self.idle = threading.Condition(self.lock)
+
+    def use_parse_pool(self, parse_pool):
+        """Přepne parsování do procesů (volá ReaderCore nad PROCESS_PARSE_THRESHOLD kanálů)"""
+        with self.lock:
+            if self.parse_pool is None:
+                self.finisher = ThreadPoolExecutor(max_workers=1, thread_name_prefix="finish")
+                self.parse_pool = parse_pool
+
+    def submit(self, channel_name, channel_id, callback):
+        """Naplánuje stažení feedu; callback(name, id, feed) se volá z pracovního vlákna
+
+        callback se zavolá právě jednou; na výsledek stažení se čeká nejvýš
+        deadline (+ DEADLINE_GRACE), feed, který dorazí až po limitu, se jen uloží.
+        """
+        reported = threading.Lock()
+
+        def report(feed):
+            if reported.acquire(blocking=False):
+                callback(channel_name, channel_id, feed)
+
+        def timed_out():
+            error("feed_deadline", f"limit {self.deadline:.0f} s", channel_id)
+            report(empty_feed(error=TimeoutError(f"překročen limit {self.deadline:.0f} s")))
+
+        def finished():
+            with self.lock:
+                self.parsing -= 1
+                if not self.parsing:
+                    self.idle.notify_all()
+
+        def finish(raw, parsed, start):
+            try:
+                try:
+                    title, entries = parsed.result()
+                    feed = parsed_feed(title, entries)
+                except youtube_feed.FeedFormatError:
+                    feed = parse_other_feed(raw[0])
+                # Doba parsování včetně čekání ve frontě procesů
+                observe("feed_parse", time.perf_counter() - start, channel_id)
+                report(store_feed(channel_id, self.store, feed, raw))
+            finally:
+                finished()
+
+        def parsed_done(raw, parsed, start):
+            try:
+                self.finisher.submit(finish, raw, parsed, start).add_done_callback(done)
+            except RuntimeError as e:  # fetcher už je ukončený
+                finished()
+                report(empty_feed(error=e))
+
+        def fetch():
+            key = self.watch.add(self.deadline + DEADLINE_GRACE, timed_out)
+            try:
+                with self.lock:
+                    parse_pool = self.parse_pool
+                if parse_pool is None:
+                    report(fetch_feed(channel_id, self.store, self.deadline))
+                    return
+                feed, raw = download_feed(channel_id, self.store, self.deadline)
+            finally:
+                self.watch.cancel(key)
+            if raw is None:
+                report(feed)
+                return
+            start = time.perf_counter()
+            with self.lock:
+                self.parsing += 1
+            parsed = parse_pool.submit(raw[0])
+            parsed.add_done_callback(lambda parsed: parsed_done(raw, parsed, start))
+
+        def done(future):
+            if future.cancelled():
+                return
+            e = future.exception()
+            if e is not None:
+                print(f"Chyba při stahování kanálu {channel_name}: {e}")
+                error("feed_fetch", e, channel_id)
+                report(None)
+
+        future = self.executor.submit(fetch)
+        future.add_done_callback(done)
+        return future
+
+    def fetch_all(self, channels, callback):
+        """Naplánuje stažení všech kanálů ze slovníku název -> ID"""
+        return [self.submit(name, channel_id, callback) for name, channel_id in channels.items()]
+
+    def shutdown(self, wait=False):
+        """Ukončení poolu; s wait=True se počká na dokončení rozběhnutých stažení i parsování"""
+        self.executor.shutdown(wait=wait, cancel_futures=not wait)
+        if self.parse_pool is None:
+            return
+        if wait:
+            self.parse_pool.flush()
+            with self.lock:
+                while self.parsing:
+                    self.idle.wait()
+        self.finisher.shutdown(wait=wait, cancel_futures=not wait)
+        self.parse_pool.shutdown(wait=wait)
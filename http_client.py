@@ -0,0 +1,128 @@
+import threading
+import time
+from urllib.parse import urlsplit
+
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/120.0.0.0 Safari/537.36"
+)
+
+TIMEOUT = (5, 15)        # (připojení, čtení) v sekundách
+RETRIES = 3              # opakování při chybě spojení a odpovědích 429/5xx
+BACKOFF = 0.5            # 0.5 s, 1 s, 2 s ...
+HOST_CONNECTIONS = 8     # max. souběžných požadavků a udržovaných spojení na jeden host
+
+
+class HttpClient:
+    """Sdílený HTTP klient: keep-alive pool spojení, timeouty, opakování a limit na host
+
+    requests (a urllib3) se importuje až při prvním požadavku, aby nezdržoval
+    start aplikace. S deadline (čas podle time.monotonic) se po jeho uplynutí
+    už neopakuje a nečeká se na Retry-After ani backoff, který by ho přesáhl.
+    """
+
+    def __init__(self, verify=True, timeout=TIMEOUT, retries=RETRIES, host_connections=HOST_CONNECTIONS):
+        self.verify = verify
+        self.timeout = timeout
+        self.retries = retries
+        self.host_connections = host_connections
+        self._session = None
+        self.host_limits = {}
+        self.lock = threading.Lock()
+        self.local = threading.local()  # deadline právě běžícího požadavku vlákna
+
+    @property
+    def session(self):
+        with self.lock:
+            if self._session is None:
+                self._session = self.create_session()
+            return self._session
+
+    def create_session(self):
+        import requests
+        import urllib3
+        from requests.adapters import HTTPAdapter
+        from urllib3.exceptions import MaxRetryError, ResponseError
+        from urllib3.util.retry import Retry
+
+        local = self.local
+
+        class DeadlineRetry(Retry):
+            """Opakování, které nepřekročí deadline požadavku (HttpClient.get)"""
+
+            def increment(self, method=None, url=None, response=None, error=None, _pool=None, _stacktrace=None):
+                retry = super().increment(method, url, response, error, _pool, _stacktrace)
+                end = getattr(local, "end", None)
+                if end is None:
+                    return retry
+                wait = retry.get_backoff_time()
+                if response is not None and retry.respect_retry_after_header:
+                    retry_after = retry.get_retry_after(response)
+                    if retry_after is not None:
+                        wait = retry_after
+                if time.monotonic() + wait >= end:
+                    raise MaxRetryError(_pool, url, error or ResponseError("opakování by překročilo časový limit"))
+                return retry
+
+            def sleep(self, response=None):
+                end = getattr(local, "end", None)
+                if end is None:
+                    return super().sleep(response)
+                wait = self.get_backoff_time()
+                if response is not None and self.respect_retry_after_header:
+                    retry_after = self.get_retry_after(response)
+                    if retry_after is not None:
+                        wait = retry_after
+                time.sleep(max(0.0, min(wait, end - time.monotonic())))
+
+        if not self.verify:
+            # Potlačení warningu při ověřování SSL, pokud verify=False
+            urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+        session = requests.Session()
+        session.headers["User-Agent"] = USER_AGENT
+        retry = DeadlineRetry(
+            total=self.retries,
+            backoff_factor=BACKOFF,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=("GET", "HEAD"),
+        )
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.host_connections, max_retries=retry)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def host_limit(self, url):
+        host = urlsplit(url).netloc
+        with self.lock:
+            limit = self.host_limits.get(host)
+            if limit is None:
+                limit = self.host_limits[host] = threading.BoundedSemaphore(self.host_connections)
+            return limit
+
+    def get(self, url, headers=None, timeout=None, stream=False, deadline=None):
+        """GET požadavek; u stream=True omezuje limit na host jen navázání spojení
+
+        deadline (time.monotonic) omezuje opakování; čtení těla při stream=True
+        si hlídá volající.
+        """
+        with self.host_limit(url):
+            self.local.end = deadline
+            try:
+                return self.session.get(
+                    url,
+                    headers=headers,
+                    timeout=timeout or self.timeout,
+                    verify=self.verify,
+                    stream=stream,
+                )
+            finally:
+                self.local.end = None
+
+
+# Výchozí klient pro celou aplikaci (RSSReaderD.py nastavuje verify=False)
+client = HttpClient()
+
+
+def get(url, headers=None, timeout=None, stream=False, deadline=None):
+    return client.get(url, headers=headers, timeout=timeout, stream=stream, deadline=deadline)
@@ -0,0 +1,221 @@
+"""Měření doby operací, počítadla po kanálech a záznam chyb
+
+Horké cesty (stažení a parsování feedu, náhledy, zápisy na disk) se měří
+přes timed(); výsledky jsou v histogramech podle operace a kanálu.
+Stav jde zobrazit v ladicím panelu GUI (debug_panel.py), uložit jako JSON
+(snapshot/dump), průběžně zapisovat jako JSON řádky (start_log)
+a v headless režimu vystavit ve formátu Prometheus (prometheus).
+Modul nesmí importovat PyQt5.
+"""
+import json
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from contextlib import contextmanager
+
+# Horní meze košů histogramu v sekundách (jako výchozí koše klientů Prometheus)
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+RECENT_ERRORS = 100  # počet posledních chyb držených v paměti
+
+PREFIX = "rss_reader"
+
+
+class Histogram:
+    """Počty měření v koších podle BUCKETS, součet a maximum"""
+
+    __slots__ = ("counts", "sum", "max")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)  # poslední koš je +Inf
+        self.sum = 0.0
+        self.max = 0.0
+
+    @property
+    def count(self):
+        return sum(self.counts)
+
+    def observe(self, seconds):
+        self.counts[bisect_left(BUCKETS, seconds)] += 1
+        self.sum += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def merge(self, other):
+        for index, value in enumerate(other.counts):
+            self.counts[index] += value
+        self.sum += other.sum
+        self.max = max(self.max, other.max)
+
+    def quantile(self, q):
+        """Horní mez koše, do kterého padne kvantil q (nejvýš maximum měření)"""
+        rank = q * self.count
+        seen = 0
+        for index, value in enumerate(self.counts):
+            seen += value
+            if value and seen >= rank:
+                return min(BUCKETS[index], self.max) if index < len(BUCKETS) else self.max
+        return 0.0
+
+    def summary(self):
+        count = self.count
+        return {
+            "count": count,
+            "sum": self.sum,
+            "mean": self.sum / count if count else 0.0,
+            "p50": self.quantile(0.5),
+            "p90": self.quantile(0.9),
+            "p99": self.quantile(0.99),
+            "max": self.max,
+        }
+
+
+class Metrics:
+    """Sdílené histogramy a počítadla; volat jde z libovolného vlákna"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.histograms = {}  # (operace, kanál nebo None) -> Histogram
+        self.counters = {}    # (název, kanál nebo None) -> hodnota
+        self.error_counts = {}  # operace -> počet chyb
+        self.errors = deque(maxlen=RECENT_ERRORS)
+        self.log = None
+        self.started = time.time()
+
+    def observe(self, operation, seconds, channel=None):
+        with self.lock:
+            histogram = self.histograms.get((operation, channel))
+            if histogram is None:
+                histogram = self.histograms[(operation, channel)] = Histogram()
+            histogram.observe(seconds)
+        self.write_log({"event": operation, "channel": channel, "seconds": round(seconds, 6)})
+
+    @contextmanager
+    def timed(self, operation, channel=None):
+        """with timed("feed_parse", channel_id): ... změří dobu bloku (i při výjimce)"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(operation, time.perf_counter() - start, channel)
+
+    def count(self, name, channel=None, value=1):
+        with self.lock:
+            self.counters[(name, channel)] = self.counters.get((name, channel), 0) + value
+
+    def error(self, operation, error, channel=None):
+        """Záznam chyby: počty podle operace (a kanálu) a poslední chyby s textem výjimky"""
+        record = {"time": time.time(), "operation": operation, "channel": channel, "error": str(error)}
+        with self.lock:
+            self.error_counts[operation] = self.error_counts.get(operation, 0) + 1
+            if channel is not None:
+                self.counters[("errors", channel)] = self.counters.get(("errors", channel), 0) + 1
+            self.errors.append(record)
+        self.write_log({"event": "error", "operation": operation, "channel": channel, "error": str(error)})
+
+    def start_log(self, path):
+        """Průběžný zápis všech měření a chyb jako JSON řádků do souboru"""
+        log = open(path, "a", encoding="utf-8", buffering=1)
+        with self.lock:
+            self.log = log
+
+    def write_log(self, record):
+        if self.log is None:
+            return
+        line = json.dumps({"time": time.time(), **record}, ensure_ascii=False) + "\n"
+        with self.lock:
+            if self.log is not None:
+                self.log.write(line)
+
+    def reset(self):
+        with self.lock:
+            self.histograms = {}
+            self.counters = {}
+            self.error_counts = {}
+            self.errors.clear()
+            self.started = time.time()
+
+    def snapshot(self):
+        """Souhrn pro JSON: operace (přes všechny kanály), kanály a poslední chyby"""
+        with self.lock:
+            histograms = {key: (list(h.counts), h.sum, h.max) for key, h in self.histograms.items()}
+            counters = dict(self.counters)
+            error_counts = dict(self.error_counts)
+            errors = list(self.errors)
+            started = self.started
+        operations = {}
+        channels = {}
+        for (operation, channel), (counts, total, maximum) in histograms.items():
+            histogram = Histogram()
+            histogram.counts, histogram.sum, histogram.max = counts, total, maximum
+            operations.setdefault(operation, Histogram()).merge(histogram)
+            if channel is not None:
+                channels.setdefault(channel, {})[operation] = histogram.summary()
+        for (name, channel), value in counters.items():
+            if channel is not None:
+                channels.setdefault(channel, {})[name] = value
+        return {
+            "uptime": time.time() - started,
+            "operations": {name: histogram.summary() for name, histogram in sorted(operations.items())},
+            "counters": {name: value for (name, channel), value in sorted(counters.items()) if channel is None},
+            "errors": error_counts,
+            "channels": channels,
+            "recent_errors": errors,
+        }
+
+    def dump(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.snapshot(), f, ensure_ascii=False, indent=4)
+
+    def prometheus(self):
+        """Textový formát Prometheus (exposition format 0.0.4)"""
+        with self.lock:
+            histograms = sorted(
+                ((operation, channel or "", list(h.counts), h.sum) for (operation, channel), h in self.histograms.items())
+            )
+            counters = sorted(((name, channel or "", value) for (name, channel), value in self.counters.items()))
+            error_counts = sorted(self.error_counts.items())
+        lines = [
+            f"# HELP {PREFIX}_operation_seconds Doba operací (stažení, parsování, náhledy, zápisy)",
+            f"# TYPE {PREFIX}_operation_seconds histogram",
+        ]
+        for operation, channel, counts, total in histograms:
+            labels = f'operation="{label_value(operation)}",channel="{label_value(channel)}"'
+            cumulative = 0
+            for bound, value in zip((*BUCKETS, "+Inf"), counts):
+                cumulative += value
+                lines.append(f'{PREFIX}_operation_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f"{PREFIX}_operation_seconds_sum{{{labels}}} {total}")
+            lines.append(f"{PREFIX}_operation_seconds_count{{{labels}}} {cumulative}")
+        lines += [f"# HELP {PREFIX}_events_total Počítadla událostí", f"# TYPE {PREFIX}_events_total counter"]
+        for name, channel, value in counters:
+            lines.append(f'{PREFIX}_events_total{{event="{label_value(name)}",channel="{label_value(channel)}"}} {value}')
+        lines += [f"# HELP {PREFIX}_errors_total Chyby podle operace", f"# TYPE {PREFIX}_errors_total counter"]
+        for operation, value in error_counts:
+            lines.append(f'{PREFIX}_errors_total{{operation="{label_value(operation)}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+
+def label_value(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+# Výchozí registr pro celou aplikaci
+metrics = Metrics()
+
+
+def timed(operation, channel=None):
+    return metrics.timed(operation, channel)
+
+
+def observe(operation, seconds, channel=None):
+    metrics.observe(operation, seconds, channel)
+
+
+def count(name, channel=None, value=1):
+    metrics.count(name, channel, value)
+
+
+def error(operation, e, channel=None):
+    metrics.error(operation, e, channel)
@@ -1,44 +1,127 @@
-import json
+import argparse
+import re
+import sys
 import xml.etree.ElementTree as ET
-from datetime import datetime
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from xml.sax.saxutils import escape, quoteattr
+
+from Parse_val import REQUESTS_PER_SECOND, UNKNOWN_CHANNEL, RateLimiter, merge_channels, resolve
+from feed_fetcher import FETCH_WORKERS
+from channel_journal import CHANNELS_FILE, ChannelJournal
 
-INPUT_JSON = "RSS_channels.json"
 OUTPUT_OPML = "youtube.opml"
 
 YOUTUBE_RSS = "https://www.youtube.com/feeds/videos.xml?channel_id="
+CHANNEL_ID_URL = re.compile(r"channel_id=(UC[\w-]{22})|/channel/(UC[\w-]{22})")
+
+# Počet rozpracovaných ověření na jedno vlákno (omezuje paměť u velkých OPML)
+PENDING_PER_WORKER = 4
+
+
+def export_opml(channels_file, output):
+    """Zápis OPML po jednotlivých outline, bez stromu v paměti; vrací počet kanálů"""
+    channels = ChannelJournal(channels_file).load()
+    with open(output, "w", encoding="utf-8") as f:
+        f.write('<?xml version="1.0" encoding="utf-8"?>\n<opml version="1.0">\n<head>\n')
+        f.write("<title>YouTube Subscriptions</title>\n")
+        f.write(f"<dateCreated>{escape(datetime.now(timezone.utc).isoformat())}</dateCreated>\n")
+        f.write('</head>\n<body>\n<outline text="YouTube" title="YouTube">\n')
+        # jedna složka pro YouTube
+        for name, channel_id in channels.items():
+            f.write(
+                f'<outline type="rss" text={quoteattr(name)} title={quoteattr(name)} '
+                f"xmlUrl={quoteattr(YOUTUBE_RSS + channel_id)} />\n"
+            )
+        f.write("</outline>\n</body>\n</opml>\n")
+    return len(channels)
+
+
+def opml_outlines(path):
+    """Proudové čtení OPML: (název, xmlUrl, channel_id nebo None) pro každý feed
+
+    Zpracované outline se hned odeberou ze stromu, takže paměť nezávisí
+    na velikosti souboru.
+    """
+    parents = []
+    for event, elem in ET.iterparse(path, events=("start", "end")):
+        if event == "start":
+            parents.append(elem)
+            continue
+        parents.pop()
+        if elem.tag != "outline":
+            continue
+        url = elem.get("xmlUrl")
+        if url:
+            match = CHANNEL_ID_URL.search(url)
+            channel_id = (match.group(1) or match.group(2)) if match else None
+            yield elem.get("title") or elem.get("text") or "", url, channel_id
+        if parents and len(parents[-1]) and parents[-1][-1] is elem:
+            del parents[-1][-1]
 
-with open(INPUT_JSON, "r", encoding="utf-8") as f:
-    channels = json.load(f)
-
-# OPML root
-opml = ET.Element("opml", version="1.0")
-
-head = ET.SubElement(opml, "head")
-ET.SubElement(head, "title").text = "YouTube Subscriptions"
-ET.SubElement(head, "dateCreated").text = datetime.utcnow().isoformat()
-
-body = ET.SubElement(opml, "body")
-
-# jedna složka pro YouTube
-folder = ET.SubElement(
-    body,
-    "outline",
-    text="YouTube",
-    title="YouTube"
-)
-
-for name, channel_id in channels.items():
-    ET.SubElement(
-        folder,
-        "outline",
-        type="rss",
-        text=name,
-        title=name,
-        xmlUrl=YOUTUBE_RSS + channel_id
+
+def import_opml(path, channels_file, workers=FETCH_WORKERS, rate=REQUESTS_PER_SECOND, validate=True):
+    """Import YouTube kanálů z OPML se souběžným ověřením feedů; vrací přidané kanály"""
+    resolved = {}   # channel_id -> název (None = kanál neexistuje)
+    pending = deque()
+    counts = {"skipped": 0, "failed": 0}
+    limiter = RateLimiter(rate)
+
+    def finish(limit):
+        while len(pending) > limit:
+            channel_id, future = pending.popleft()
+            try:
+                resolved[channel_id] = future.result()
+            except Exception as e:
+                print(f"Chyba při načítání kanálu {channel_id}: {e}", file=sys.stderr)
+                counts["failed"] += 1
+
+    seen = set()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for name, url, channel_id in opml_outlines(path):
+            if channel_id is None:
+                counts["skipped"] += 1
+                continue
+            if channel_id in seen:
+                continue
+            seen.add(channel_id)
+            if not validate:
+                resolved[channel_id] = name or UNKNOWN_CHANNEL
+                continue
+            pending.append((channel_id, executor.submit(resolve, channel_id, limiter)))
+            finish(workers * PENDING_PER_WORKER)
+        finish(0)
+
+    added = merge_channels(channels_file, resolved)
+    missing = sum(1 for title in resolved.values() if title is None)
+    print(
+        f"Kanálů v OPML: {len(seen)}, přidáno: {len(added)}, neexistuje: {missing}, "
+        f"chyba: {counts['failed']}, jiné než YouTube feedy: {counts['skipped']}",
+        file=sys.stderr,
     )
+    return added
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export a import odebíraných kanálů ve formátu OPML")
+    parser.add_argument("command", nargs="?", choices=("export", "import"), default="export")
+    parser.add_argument("opml", nargs="?", help=f"soubor OPML (výchozí pro export: {OUTPUT_OPML})")
+    parser.add_argument("--channels", default=CHANNELS_FILE, help="soubor kanálů čtečky")
+    parser.add_argument("--workers", type=int, default=FETCH_WORKERS)
+    parser.add_argument("--rate", type=float, default=REQUESTS_PER_SECOND, help="max. požadavků za sekundu")
+    parser.add_argument("--no-validate", action="store_true", help="importovat bez stažení feedů (názvy z OPML)")
+    args = parser.parse_args()
+
+    if args.command == "export":
+        output = args.opml or OUTPUT_OPML
+        count = export_opml(args.channels, output)
+        print(f"✅ Hotovo! OPML uložen jako {output} ({count} kanálů)")
+    else:
+        if not args.opml:
+            parser.error("import vyžaduje soubor OPML")
+        import_opml(args.opml, args.channels, args.workers, args.rate, not args.no_validate)
 
-# uložit OPML
-tree = ET.ElementTree(opml)
-tree.write(OUTPUT_OPML, encoding="utf-8", xml_declaration=True)
 
-print(f"✅ Hotovo! OPML uložen jako {OUTPUT_OPML}")
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""Modely seznamů kanálů a videí pro QListView
+
+Pohled se ptá jen na viditelné řádky (uniformItemSizes) a rozvržení
+dlouhého seznamu dělá po dávkách, takže přepnutí na kanál s tisíci videí
+je jen výměna seznamu v modelu. Hledání řádku podle názvu kanálu nebo
+videoId používá slovníkový index.
+"""
+from PyQt5.QtCore import QAbstractListModel, QModelIndex, Qt, pyqtSignal
+from PyQt5.QtGui import QColor
+from PyQt5.QtWidgets import QListView
+
+from channel_health import BROKEN, STALE
+
+# Označení nezhlédnutého videa v seznamu videí
+UNREAD_MARK = "● "
+
+# Počet řádků rozvržených najednou; zbytek dlouhého seznamu se rozvrhne v dalších průchodech smyčky událostí
+LAYOUT_BATCH = 200
+
+# Zobrazení kanálů, jejichž stažení selhává (viz channel_health.py)
+STATE_SUFFIX = {STALE: " (neaktuální)", BROKEN: " (nedostupný)"}
+STATE_COLOR = {STALE: QColor("gray"), BROKEN: QColor("firebrick")}
+
+
+class ChannelListModel(QAbstractListModel):
+    """Názvy kanálů s indexem název -> řádek, počty nezhlédnutých videí a stav selhávajících kanálů"""
+
+    def __init__(self, names=()):
+        super().__init__()
+        self.names = list(names)
+        self.rows = {name: row for row, name in enumerate(self.names)}
+        self.states = {}  # název -> (stav, popis), jen kanály, které nejsou v pořádku
+        self.unread = {}  # název -> počet nezhlédnutých videí, jen nenulové
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.names)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        name = self.names[index.row()]
+        state, message = self.states.get(name, (None, None))
+        if role == Qt.DisplayRole:
+            unread = self.unread.get(name)
+            return name + (f" ({unread})" if unread else "") + STATE_SUFFIX.get(state, "")
+        if role == Qt.ForegroundRole:
+            return STATE_COLOR.get(state)
+        if role == Qt.ToolTipRole:
+            return message
+        return None
+
+    def set_state(self, name, state, message=""):
+        """Stav kanálu podle channel_health; stav ok zruší označení"""
+        if state in STATE_SUFFIX:
+            if self.states.get(name) == (state, message):
+                return
+            self.states[name] = (state, message)
+        elif self.states.pop(name, None) is None:
+            return
+        self.row_changed(name)
+
+    def set_unread(self, name, count):
+        """Počet nezhlédnutých videí kanálu zobrazený za názvem"""
+        if self.unread.get(name, 0) == count:
+            return
+        if count:
+            self.unread[name] = count
+        else:
+            del self.unread[name]
+        self.row_changed(name)
+
+    def row_changed(self, name):
+        row = self.rows.get(name)
+        if row is not None:
+            index = self.index(row, 0)
+            self.dataChanged.emit(index, index)
+
+    def set_names(self, names):
+        self.beginResetModel()
+        self.names = list(names)
+        self.rows = {name: row for row, name in enumerate(self.names)}
+        self.endResetModel()
+
+    def name(self, row):
+        return self.names[row]
+
+    def row(self, name):
+        """Řádek kanálu, -1 pokud v seznamu není"""
+        return self.rows.get(name, -1)
+
+    def add(self, name):
+        """Přidá kanál na konec, pokud v seznamu ještě není; vrací jeho řádek"""
+        row = self.rows.get(name)
+        if row is None:
+            row = len(self.names)
+            self.beginInsertRows(QModelIndex(), row, row)
+            self.names.append(name)
+            self.rows[name] = row
+            self.endInsertRows()
+        return row
+
+    def remove(self, name):
+        self.states.pop(name, None)
+        self.unread.pop(name, None)
+        row = self.rows.pop(name, None)
+        if row is None:
+            return
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self.names[row]
+        for index in range(row, len(self.names)):
+            self.rows[self.names[index]] = index
+        self.endRemoveRows()
+
+
+class VideoListModel(QAbstractListModel):
+    """Videa zobrazeného seznamu; text řádku se skládá až při vykreslení
+
+    names (volitelně) jsou názvy kanálů ke každému videu pro sloučené
+    seznamy ("kanál: název videa"). Seznamy se nekopírují.
+    is_watched(videoId) určuje videa, která se neoznačí jako nezhlédnutá.
+    """
+
+    def __init__(self, is_watched=None):
+        super().__init__()
+        self.is_watched = is_watched
+        self.videos = []
+        self.names = None
+        self.rows = None  # videoId -> řádek, sestaví se až při prvním hledání
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.videos)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and index.isValid():
+            row = index.row()
+            video = self.videos[row]
+            title = video.title
+            if self.names is not None:
+                title = f"{self.names[row]}: {title}"
+            if self.is_watched is not None and not self.is_watched(video.video_id):
+                title = UNREAD_MARK + title
+            return title
+        return None
+
+    def set_videos(self, videos, names=None):
+        self.beginResetModel()
+        self.videos = videos
+        self.names = names
+        self.rows = None
+        self.endResetModel()
+
+    def clear(self):
+        self.set_videos([])
+
+    def video(self, row):
+        return self.videos[row]
+
+    def row(self, video_id):
+        """Řádek videa podle videoId, -1 pokud v seznamu není"""
+        if self.rows is None:
+            self.rows = {video.video_id: row for row, video in reversed(list(enumerate(self.videos)))}
+        return self.rows.get(video_id, -1)
+
+    def video_changed(self, row):
+        index = self.index(row, 0)
+        self.dataChanged.emit(index, index)
+
+
+class ListView(QListView):
+    """QListView s rozhraním výběru jako QListWidget (currentRow, currentRowChanged)"""
+
+    currentRowChanged = pyqtSignal(int)
+
+    def __init__(self, model):
+        super().__init__()
+        self.setUniformItemSizes(True)
+        self.setLayoutMode(QListView.Batched)
+        self.setBatchSize(LAYOUT_BATCH)
+        self.setModel(model)
+        self.selectionModel().currentRowChanged.connect(
+            lambda current, previous: self.currentRowChanged.emit(current.row())
+        )
+
+    def currentRow(self):
+        return self.currentIndex().row()
+
+    def setCurrentRow(self, row):
+        self.setCurrentIndex(self.model().index(row, 0))
@@ -0,0 +1,105 @@
+"""Parsování feedů v procesech pro velké počty kanálů
+
+Parsování tisíců feedů je vázané na CPU a v jednom procesu ho drží GIL.
+ParsePool posílá surové bajty feedů do procesů po dávkách (PARSE_BATCH
+feedů nebo co se sejde za PARSE_BATCH_DELAY) a zpět dostává kompaktní
+n-tice polí Video, takže režie pickle a IPC je na feed malá.
+Procesy se spouští metodou spawn (bez fork z vícevláknového GUI).
+"""
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+
+import youtube_feed
+from video import Video
+
+# Od tohoto počtu odebíraných kanálů se feedy parsují v procesech
+PROCESS_PARSE_THRESHOLD = 500
+PARSE_PROCESSES = os.cpu_count() or 1
+PARSE_BATCH = 32           # feedů v jedné zprávě do procesu
+PARSE_BATCH_DELAY = 0.01   # s, nejdelší čekání na doplnění dávky
+
+
+def parse_batch(items):
+    """V procesu: [bajty feedu] -> [(název, [pole Video]) nebo text FeedFormatError]"""
+    results = []
+    for data in items:
+        try:
+            title, videos = youtube_feed.parse(data)
+        except youtube_feed.FeedFormatError as e:
+            results.append(str(e))
+            continue
+        results.append((title, [tuple(getattr(video, name) for name in Video.__slots__) for video in videos]))
+    return results
+
+
+class ParsePool:
+    """Pool procesů pro youtube_feed.parse s dávkováním požadavků
+
+    submit(bajty) vrací Future s (název, [Video]) nebo výjimkou
+    FeedFormatError (nestandardní feed pak parsuje volající feedparserem).
+    """
+
+    def __init__(self, processes=PARSE_PROCESSES, batch_size=PARSE_BATCH, batch_delay=PARSE_BATCH_DELAY):
+        self.executor = ProcessPoolExecutor(processes, mp_context=multiprocessing.get_context("spawn"))
+        self.batch_size = batch_size
+        self.batch_delay = batch_delay
+        self.batch = []  # [(bajty, Future)]
+        self.timer = None
+        self.lock = threading.Lock()
+
+    def submit(self, data):
+        future = Future()
+        with self.lock:
+            self.batch.append((data, future))
+            if len(self.batch) >= self.batch_size:
+                self.flush_locked()
+            elif self.timer is None:
+                self.timer = threading.Timer(self.batch_delay, self.flush)
+                self.timer.daemon = True
+                self.timer.start()
+        return future
+
+    def parse(self, data):
+        """Blokující varianta submit pro jednoduché smyčky"""
+        return self.submit(data).result()
+
+    def flush(self):
+        with self.lock:
+            self.flush_locked()
+
+    def flush_locked(self):
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        if not self.batch:
+            return
+        batch, self.batch = self.batch, []
+        futures = [future for _, future in batch]
+        try:
+            result = self.executor.submit(parse_batch, [data for data, _ in batch])
+        except Exception as e:  # pool už je ukončený
+            for future in futures:
+                future.set_exception(e)
+            return
+        result.add_done_callback(lambda done: self.deliver(futures, done))
+
+    @staticmethod
+    def deliver(futures, done):
+        try:
+            results = done.result()
+        except Exception as e:
+            for future in futures:
+                future.set_exception(e)
+            return
+        for future, result in zip(futures, results):
+            if isinstance(result, str):
+                future.set_exception(youtube_feed.FeedFormatError(result))
+            else:
+                title, fields = result
+                future.set_result((title, [Video(*values) for values in fields]))
+
+    def shutdown(self, wait=False):
+        self.flush()
+        self.executor.shutdown(wait=wait, cancel_futures=not wait)
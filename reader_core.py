@@ -0,0 +1,291 @@
+"""Jádro čtečky bez GUI: kanály, feedy, úložiště a průběžná obnova
+
+Používá ho Qt aplikace (RSSReaderD.py) i headless režim (rss_daemon.py).
+Modul ani jeho závislosti nesmí importovat PyQt5.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from channel_health import ChannelHealth, OK
+from channel_journal import CHANNELS_FILE, ChannelJournal
+from channel_resolver import HANDLE_CACHE_FILE, ChannelResolver
+from entry_store import EntryStore, STORE_FILE
+from feed_fetcher import FeedFetcher, FETCH_WORKERS, fetch_feed
+from instrumentation import error, timed
+from parse_pool import PROCESS_PARSE_THRESHOLD, ParsePool
+from refresh_scheduler import RefreshScheduler
+from timeline import ALL_CHANNELS, Timeline
+from watch_state import WatchState
+
+# Údržba archivu videí v úložišti (EntryStore.compact) na pozadí
+COMPACT_DELAY = 10 * 60       # s od start(), aby nebrzdila první obnovu
+COMPACT_INTERVAL = 24 * 3600
+
+
+def failure_reason(feed):
+    """Krátký popis selhání stažení pro stav kanálu"""
+    if feed is None:
+        return "chyba stažení"
+    if feed.get("bozo_exception") is not None:
+        return str(feed.bozo_exception)
+    if feed.get("status"):
+        return f"HTTP {feed.status}"
+    return "prázdný feed"
+
+
+class ReaderCore:
+    """Stav čtečky nezávislý na GUI
+
+    Výsledky stahování se předávají funkci callback(name, id, feed) z pracovních
+    vláken. GUI ji přesměruje signálem do svého vlákna a tam zavolá apply_feed;
+    bez GUI se apply_feed volá přímo (stav chrání zámek).
+    """
+
+    def __init__(self, callback=None, fetch_workers=FETCH_WORKERS,
+                 channels_file=CHANNELS_FILE, store_file=STORE_FILE, handles_file=HANDLE_CACHE_FILE,
+                 parse_threshold=PROCESS_PARSE_THRESHOLD):
+        self.journal = ChannelJournal(channels_file)
+        self.channels = {}          # channel_name -> {'id': channel_id, 'entries': [Video]}
+        self.pending_channels = {}  # uložené kanály, jejichž feed se zatím nepodařilo načíst
+        self.timeline = Timeline()
+        self.lock = threading.RLock()
+        self.store = EntryStore(store_file)
+        self.health = ChannelHealth(self.store)
+        self.watch = WatchState(self.store)
+        self.fetcher = FeedFetcher(fetch_workers, self.store)
+        self.resolver = ChannelResolver(handles_file)
+        self.fetch_workers = fetch_workers
+        self.parse_threshold = parse_threshold  # od kolika kanálů parsovat v procesech (None = nikdy)
+        self.callback = callback or self.apply_feed
+        self.scheduler = RefreshScheduler(self.fetcher, self.callback)
+        self.stopped = threading.Event()
+        self.compactor = threading.Thread(target=self.compact_loop, name="compact", daemon=True)
+        self.history = (None, None, [])  # (název, entries z feedu, feed + archiv) naposledy zobrazeného kanálu
+
+    def subscriptions(self):
+        """Všechny odebírané kanály: název -> ID"""
+        with self.lock:
+            data = dict(self.pending_channels)
+            data.update({name: info["id"] for name, info in self.channels.items()})
+            return data
+
+    def load_channels(self):
+        """Načtení kanálů ze souboru a jejich videí z lokálního úložiště (bez sítě)"""
+        try:
+            with timed("channels_load"):
+                saved_channels = self.journal.load()
+            with timed("store_load"):
+                stored = self.store.load_all()
+            self.health.load()
+            self.watch.load()
+            with self.lock:
+                for channel_name, channel_id in saved_channels.items():
+                    if channel_id in stored:
+                        self.channels[channel_name] = {"id": channel_id, "entries": stored[channel_id]}
+                        self.watch.set_channel(channel_name, stored[channel_id])
+                    else:
+                        self.pending_channels[channel_name] = channel_id
+                self.timeline.build({name: info["entries"] for name, info in self.channels.items()})
+        except Exception as e:
+            print(f"Chyba při načítání kanálů: {e}")
+            error("channels_load", e)
+
+    def refresh_all(self):
+        """Souběžné stažení všech kanálů; výsledky jdou do callback
+
+        Kanály v odkladu po selhání se nestahují, plánovač je zkusí až po
+        jeho uplynutí. Vrací futures spuštěných stažení.
+        """
+        subscriptions = self.subscriptions()
+        if (self.fetcher.parse_pool is None and self.parse_threshold is not None
+                and len(subscriptions) >= self.parse_threshold):
+            self.fetcher.use_parse_pool(ParsePool())
+        now = time.time()
+        ready = {}
+        for channel_name, channel_id in subscriptions.items():
+            delay = self.health.retry_delay(channel_id, now)
+            if delay:
+                self.scheduler.schedule(channel_name, channel_id, delay=delay)
+            else:
+                ready[channel_name] = channel_id
+        return self.fetcher.fetch_all(ready, self.callback)
+
+    def start(self):
+        self.scheduler.start()
+        self.compactor.start()
+
+    def shutdown(self, wait=False):
+        self.stopped.set()
+        self.scheduler.stop()
+        self.fetcher.shutdown(wait)
+        self.journal.close()
+
+    def apply_feed(self, channel_name, channel_id, feed):
+        """Zpracování staženého feedu
+
+        Vrací None, pokud se nic nezměnilo (kanál byl odebrán nebo stažení
+        selhalo), False pro nezměněný feed (304) a True pro nová videa.
+        """
+        with self.lock:
+            # Kanál mezitím odebraný uživatelem se už nepřidává ani neobnovuje
+            if channel_name not in self.channels and channel_name not in self.pending_channels:
+                return None
+            # Bez sítě zůstávají data z úložiště, další pokus až po odkladu
+            if feed is None or not feed.entries:
+                delay = self.health.failure(channel_id, failure_reason(feed))
+                self.scheduler.schedule(channel_name, channel_id, delay=delay)
+                return None
+            self.health.success(channel_id)
+            self.scheduler.schedule(channel_name, channel_id, feed.entries)
+            self.pending_channels.pop(channel_name, None)
+            if feed.get("status") == 304 and channel_name in self.channels:
+                return False
+            self.set_channel_entries(channel_name, channel_id, feed.entries)
+            return True
+
+    def set_channel_entries(self, channel_name, channel_id, entries):
+        """Nastavení videí kanálu včetně průběžné aktualizace sloučené časové osy"""
+        with self.lock:
+            old_entries = self.channels[channel_name]["entries"] if channel_name in self.channels else []
+            self.channels[channel_name] = {"id": channel_id, "entries": entries}
+            self.timeline.update_channel(channel_name, old_entries, entries)
+            self.watch.set_channel(channel_name, entries)
+
+    def channel_entries(self, channel_name):
+        """Videa kanálu včetně archivu, pro virtuální položku všechny kanály sloučená osa
+
+        Archiv se čte z úložiště jen pro zobrazovaný kanál a drží se, dokud
+        kanál nedostane nový feed; sloučená osa obsahuje jen aktuální feedy.
+        """
+        if channel_name == ALL_CHANNELS:
+            return self.timeline.videos
+        with self.lock:
+            info = self.channels.get(channel_name)
+            if info is None:
+                return []
+            name, entries, videos = self.history
+            if name != channel_name or entries is not info["entries"]:
+                videos = info["entries"] + self.store.archived(info["id"])
+                self.history = (channel_name, info["entries"], videos)
+            return videos
+
+    def mark_watched(self, channel_name, video):
+        """Označí otevřené video jako zhlédnuté; vrací True, pokud se stav změnil"""
+        with self.lock:
+            info = self.channels.get(channel_name)
+            entries = info["entries"] if info is not None else []
+        return self.watch.mark(channel_name, video, entries)
+
+    def unread_count(self, channel_name):
+        """Počet nezhlédnutých videí kanálu (pro všechny kanály součet)"""
+        if channel_name == ALL_CHANNELS:
+            return self.watch.total
+        return self.watch.unread.get(channel_name, 0)
+
+    def next_unread(self, channel_name, start=0):
+        """Řádek dalšího nezhlédnutého videa v aktuálním feedu kanálu (nebo sloučené ose), -1 pokud není"""
+        with self.lock:
+            if channel_name == ALL_CHANNELS:
+                videos = self.timeline.videos
+            else:
+                info = self.channels.get(channel_name)
+                videos = info["entries"] if info is not None else []
+            return self.watch.next_unread(videos, start)
+
+    def next_unread_channel(self, names, current=None):
+        """První kanál s nezhlédnutými videi v pořadí names za kanálem current (dokola)"""
+        start = names.index(current) + 1 if current in names else 0
+        for channel_name in names[start:] + names[:start]:
+            if channel_name != ALL_CHANNELS and self.watch.unread.get(channel_name):
+                return channel_name
+        return None
+
+    def compact(self):
+        """Oříznutí archivu podle limitů a zmenšení úložiště; vrací počet smazaných videí"""
+        try:
+            with timed("store_compact"):
+                return self.store.compact()
+        except Exception as e:
+            print(f"Chyba při údržbě úložiště: {e}")
+            error("store_compact", e)
+            return None
+
+    def compact_loop(self):
+        delay = COMPACT_DELAY
+        while not self.stopped.wait(delay):
+            self.compact()
+            delay = COMPACT_INTERVAL
+
+    def channel_state(self, channel_name):
+        """(stav, popis) kanálu podle channel_health: ok, stale nebo broken"""
+        channel_id = self.subscriptions().get(channel_name)
+        if channel_id is None:
+            return OK, ""
+        return self.health.state(channel_id)
+
+    def failed_channels(self):
+        """Odebírané kanály bez uložených videí, jejichž stažení selhává"""
+        with self.lock:
+            pending = dict(self.pending_channels)
+        return [name for name, channel_id in pending.items() if self.health.state(channel_id)[0] != OK]
+
+    def fetch_ref(self, ref):
+        """(channel_id, feed) pro UC ID, URL nebo @handle; feed je None, pokud kanál nejde najít"""
+        channel_id = self.resolver.resolve(ref)
+        if channel_id is None:
+            return None, None
+        return channel_id, fetch_feed(channel_id, self.store)
+
+    def add_channels(self, refs, callback):
+        """Souběžné vyřešení a stažení kanálů podle odkazů (viz channel_refs)
+
+        Pro každý odkaz se z pracovního vlákna zavolá callback(odkaz, channel_id, feed)
+        hned po jeho vyřízení (feed je None, pokud kanál nejde najít nebo načíst).
+        Na nic se nečeká; kanál se přidá až voláním add_fetched (GUI ve svém vlákně).
+        """
+        if not refs:
+            return
+
+        def add(ref):
+            channel_id, feed = None, None
+            try:
+                channel_id, feed = self.fetch_ref(ref)
+            except Exception as e:
+                print(f"Chyba při přidávání kanálu {ref}: {e}")
+                error("channel_add", e)
+            callback(ref, channel_id, feed)
+
+        pool = ThreadPoolExecutor(max_workers=min(self.fetch_workers, len(refs)), thread_name_prefix="add")
+        for ref in refs:
+            pool.submit(add, ref)
+        pool.shutdown(wait=False)
+
+    def add_fetched(self, channel_id, feed):
+        """Přidání kanálu se staženým feedem (z add_channels); vrací jeho název, None pro nenalezený"""
+        if feed is None or not feed.entries:
+            return None
+        channel_title = feed.feed.get("title", channel_id)
+        self.health.success(channel_id)
+        self.set_channel_entries(channel_title, channel_id, feed.entries)
+        self.scheduler.schedule(channel_title, channel_id, feed.entries)
+        self.journal.add(channel_title, channel_id)
+        return channel_title
+
+    def remove_channel(self, channel_name):
+        with self.lock:
+            if channel_name in self.channels:
+                self.store.discard(self.channels[channel_name]["id"])
+                self.timeline.update_channel(channel_name, self.channels[channel_name]["entries"], [])
+                del self.channels[channel_name]
+            self.pending_channels.pop(channel_name, None)
+            self.watch.remove_channel(channel_name)
+            self.scheduler.remove(channel_name)
+        self.journal.remove(channel_name)
+
+    def search(self, text):
+        """Fulltextové hledání: ([názvy kanálů], [Video]) od nejlepší shody"""
+        with self.lock:
+            names = {info["id"]: name for name, info in self.channels.items()}
+        results = [(names[channel_id], video) for channel_id, video in self.store.search(text) if channel_id in names]
+        return [name for name, _ in results], [video for _, video in results]
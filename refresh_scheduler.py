@@ -0,0 +1,114 @@
+import heapq
+import statistics
+import threading
+import time
+from collections import deque
+
+# Interval obnovy kanálu podle frekvence nahrávání
+MIN_INTERVAL = 3600            # aktivní kanály nejvýše jednou za hodinu
+MAX_INTERVAL = 24 * 3600       # spící kanály jednou denně
+DORMANT_AFTER = 30 * 24 * 3600  # bez nového videa déle než 30 dní = spící kanál
+INTERVAL_FRACTION = 4          # obnova ~4x za typickou mezeru mezi videi
+
+# Globální limit požadavků plánovače
+REQUESTS_PER_MINUTE = 30
+
+
+def upload_times(entries):
+    """Časy zveřejnění videí (unix timestamp) seřazené od nejnovějšího"""
+    return sorted((video.published_ts for video in entries if video.published_ts), reverse=True)
+
+
+def refresh_interval(entries, now=None):
+    """Odhad intervalu obnovy z mezer mezi nahranými videi"""
+    times = upload_times(entries)
+    if len(times) < 2:
+        return MAX_INTERVAL
+    now = time.time() if now is None else now
+    if now - times[0] > DORMANT_AFTER:
+        return MAX_INTERVAL
+    gap = statistics.median(newer - older for newer, older in zip(times, times[1:]))
+    return min(MAX_INTERVAL, max(MIN_INTERVAL, gap / INTERVAL_FRACTION))
+
+
+class RefreshScheduler:
+    """Obnova kanálů na pozadí, každý kanál s vlastním intervalem
+
+    Termíny jsou v haldě (due, název); zastaralé položky po přeplánování
+    nebo odebrání kanálu se přeskočí při výběru. Počet odeslaných
+    požadavků je omezen na REQUESTS_PER_MINUTE.
+    """
+
+    def __init__(self, fetcher, callback, requests_per_minute=REQUESTS_PER_MINUTE):
+        self.fetcher = fetcher
+        self.callback = callback  # callback(name, id, feed) z pracovního vlákna
+        self.requests_per_minute = requests_per_minute
+        self.heap = []
+        self.due = {}        # název -> čas další obnovy
+        self.ids = {}        # název -> channel_id
+        self.intervals = {}  # název -> poslední interval
+        self.sent = deque()  # časy požadavků za poslední minutu
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.run, name="refresh", daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        self.stopped.set()
+        self.wakeup.set()
+
+    def schedule(self, channel_name, channel_id, entries=None, delay=None):
+        """Naplánuje další obnovu
+
+        Interval se odhadne ze záznamů, bez nich se použije poslední interval;
+        delay (odklad po selhání) určuje čas další obnovy přímo.
+        """
+        with self.lock:
+            if entries:
+                interval = refresh_interval(entries)
+            else:
+                interval = self.intervals.get(channel_name, MIN_INTERVAL)
+            self.intervals[channel_name] = interval
+            self.ids[channel_name] = channel_id
+            due = time.time() + (interval if delay is None else delay)
+            self.due[channel_name] = due
+            heapq.heappush(self.heap, (due, channel_name))
+        self.wakeup.set()
+
+    def remove(self, channel_name):
+        with self.lock:
+            self.due.pop(channel_name, None)
+            self.ids.pop(channel_name, None)
+            self.intervals.pop(channel_name, None)
+
+    def next_ready(self):
+        """Vrátí (název, id) kanálu k obnově, nebo (None, čekání v sekundách)"""
+        with self.lock:
+            now = time.time()
+            while self.heap and self.due.get(self.heap[0][1]) != self.heap[0][0]:
+                heapq.heappop(self.heap)
+            if not self.heap:
+                return None, None
+            due, channel_name = self.heap[0]
+            if due > now:
+                return None, due - now
+            while self.sent and self.sent[0] <= now - 60:
+                self.sent.popleft()
+            if len(self.sent) >= self.requests_per_minute:
+                return None, self.sent[0] + 60 - now
+            heapq.heappop(self.heap)
+            del self.due[channel_name]
+            self.sent.append(now)
+            return channel_name, self.ids[channel_name]
+
+    def run(self):
+        while not self.stopped.is_set():
+            channel_name, result = self.next_ready()
+            if channel_name is not None:
+                self.fetcher.submit(channel_name, result, self.callback)
+                continue
+            self.wakeup.wait(result)
+            self.wakeup.clear()
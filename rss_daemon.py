@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""Headless režim čtečky: obnova kanálů bez GUI
+
+    python rss_daemon.py            # průběžná obnova podle plánovače (Ctrl+C ukončí)
+    python rss_daemon.py --once     # jednorázová obnova všech kanálů
+    python rss_daemon.py --json     # každá aktualizace kanálu jako řádek JSON na stdout
+    python rss_daemon.py --compact  # oříznutí archivu videí podle limitů a zmenšení úložiště
+
+Měření (instrumentation.py): --metrics-port vystaví http://127.0.0.1:PORT/metrics
+ve formátu Prometheus, --metrics-log zapisuje každé měření a chybu jako
+řádek JSON, --metrics-dump uloží souhrn jako JSON při ukončení.
+
+Výsledky se vždy ukládají do lokálního úložiště (RSS_store.db), takže je
+GUI při dalším spuštění zobrazí okamžitě. Modul nesmí importovat PyQt5.
+"""
+import argparse
+import json
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from feed_fetcher import FETCH_WORKERS
+from instrumentation import metrics
+from reader_core import ReaderCore
+
+
+def feed_record(channel_name, channel_id, feed):
+    """Záznam o aktualizaci kanálu pro výstup ve formátu JSON"""
+    return {
+        "channel": channel_name,
+        "id": channel_id,
+        "status": feed.get("status") if feed is not None else None,
+        "videos": [
+            {
+                "video_id": video.video_id,
+                "title": video.title,
+                "published": video.published,
+                "link": video.link,
+                "thumbnail": video.thumbnail,
+            }
+            for video in (feed.entries if feed is not None else [])
+        ],
+    }
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    """GET /metrics ve formátu Prometheus, GET /metrics.json jako souhrn JSON"""
+
+    def do_GET(self):
+        if self.path == "/metrics":
+            body = metrics.prometheus().encode("utf-8")
+            content_type = "text/plain; version=0.0.4; charset=utf-8"
+        elif self.path == "/metrics.json":
+            body = json.dumps(metrics.snapshot(), ensure_ascii=False).encode("utf-8")
+            content_type = "application/json"
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve_metrics(port, host="127.0.0.1"):
+    """Spustí HTTP server s měřeními ve vlákně na pozadí"""
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics", daemon=True).start()
+    return server
+
+
+class Daemon:
+    def __init__(self, workers=FETCH_WORKERS, as_json=False):
+        self.as_json = as_json
+        self.output_lock = threading.Lock()
+        self.core = ReaderCore(self.on_feed_loaded, workers)
+
+    def on_feed_loaded(self, channel_name, channel_id, feed):
+        """Zpracování feedu přímo v pracovním vlákně stahování"""
+        changed = self.core.apply_feed(channel_name, channel_id, feed)
+        with self.output_lock:
+            if self.as_json:
+                print(json.dumps(feed_record(channel_name, channel_id, feed), ensure_ascii=False), flush=True)
+            elif changed is None:
+                _, message = self.core.channel_state(channel_name)
+                print(f"{channel_name}: chyba načtení ({message or 'kanál odebrán'})", file=sys.stderr)
+            else:
+                state = "aktualizováno" if changed else "beze změny"
+                print(f"{channel_name}: {state} ({len(feed.entries)} videí)", file=sys.stderr)
+
+    def run_once(self):
+        self.core.load_channels()
+        self.core.refresh_all()
+        self.core.shutdown(wait=True)
+
+    def compact(self):
+        deleted = self.core.compact()
+        if deleted is not None:
+            print(f"Z archivu smazáno videí: {deleted}", file=sys.stderr)
+        self.core.shutdown()
+
+    def run_forever(self):
+        self.core.load_channels()
+        self.core.refresh_all()
+        self.core.start()
+        try:
+            self.core.scheduler.thread.join()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.core.shutdown()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Obnova YouTube RSS kanálů bez GUI")
+    parser.add_argument("--once", action="store_true", help="obnovit všechny kanály jednou a skončit")
+    parser.add_argument("--json", action="store_true", help="vypisovat aktualizace kanálů jako řádky JSON")
+    parser.add_argument("--compact", action="store_true", help="oříznout archiv videí a zmenšit úložiště")
+    parser.add_argument("--workers", type=int, default=FETCH_WORKERS, help="počet souběžných stahování")
+    parser.add_argument("--metrics-port", type=int, help="port pro /metrics ve formátu Prometheus")
+    parser.add_argument("--metrics-log", help="soubor pro měření a chyby jako řádky JSON")
+    parser.add_argument("--metrics-dump", help="soubor pro souhrn měření (JSON) při ukončení")
+    args = parser.parse_args(argv)
+    if args.metrics_log:
+        metrics.start_log(args.metrics_log)
+    if args.metrics_port is not None:
+        serve_metrics(args.metrics_port)
+    daemon = Daemon(args.workers, args.json)
+    try:
+        if args.compact:
+            daemon.compact()
+        elif args.once:
+            daemon.run_once()
+        else:
+            daemon.run_forever()
+    finally:
+        if args.metrics_dump:
+            metrics.dump(args.metrics_dump)
+
+
+if __name__ == "__main__":
+    main()
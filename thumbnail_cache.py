@@ -0,0 +1,125 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+from instrumentation import count, error
+
+THUMB_CACHE_DIR = "thumb_cache"
+
+# Limity cache náhledů
+MEMORY_ITEMS = 64                  # počet zmenšených pixmap v paměti
+DISK_BYTES = 100 * 1024 * 1024     # velikost JPEG souborů na disku
+
+
+class LRUCache:
+    """Omezená paměťová cache s vytlačováním nejdéle nepoužitých položek"""
+
+    def __init__(self, max_items=MEMORY_ITEMS):
+        self.max_items = max_items
+        self.items = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            value = self.items.get(key)
+            if value is not None:
+                self.items.move_to_end(key)
+        count("thumbnail_memory_misses" if value is None else "thumbnail_memory_hits")
+        return value
+
+    def put(self, key, value):
+        with self.lock:
+            self.items[key] = value
+            self.items.move_to_end(key)
+            while len(self.items) > self.max_items:
+                self.items.popitem(last=False)
+
+
+class DiskCache:
+    """Cache surových bajtů na disku s omezením celkové velikosti (LRU podle mtime)"""
+
+    def __init__(self, directory=THUMB_CACHE_DIR, max_bytes=DISK_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.sizes = {}  # název souboru -> velikost
+        os.makedirs(directory, exist_ok=True)
+        for name in os.listdir(directory):
+            path = os.path.join(directory, name)
+            if os.path.isfile(path):
+                self.sizes[name] = os.path.getsize(path)
+        self.total = sum(self.sizes.values())
+
+    @staticmethod
+    def file_name(key):
+        return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        name = self.file_name(key)
+        path = os.path.join(self.directory, name)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)  # čas přístupu pro LRU vytlačování
+        except OSError:
+            count("thumbnail_disk_misses")
+            return None
+        count("thumbnail_disk_hits")
+        return data
+
+    def put(self, key, data):
+        name = self.file_name(key)
+        path = os.path.join(self.directory, name)
+        try:
+            tmp_path = path + ".tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Chyba při ukládání náhledu: {e}")
+            error("thumbnail_disk_write", e)
+            return
+        with self.lock:
+            self.total += len(data) - self.sizes.get(name, 0)
+            self.sizes[name] = len(data)
+            if self.total > self.max_bytes:
+                self.evict()
+
+    def discard(self, key):
+        """Smaže uložená data (např. obrázek, který nejde dekódovat)"""
+        name = self.file_name(key)
+        try:
+            os.remove(os.path.join(self.directory, name))
+        except OSError:
+            pass
+        with self.lock:
+            self.total -= self.sizes.pop(name, 0)
+
+    def evict(self):
+        """Smaže nejdéle nepoužité soubory, dokud se cache nevejde pod limit (volá se pod zámkem)"""
+        def mtime(name):
+            try:
+                return os.path.getmtime(os.path.join(self.directory, name))
+            except OSError:
+                return 0
+        for name in sorted(self.sizes, key=mtime):
+            if self.total <= self.max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                pass
+            self.total -= self.sizes.pop(name)
+
+
+class ThumbnailCache:
+    """Dvouúrovňová cache náhledů: zmenšené pixmapy v paměti + JPEG bajty na disku
+
+    Zásahy a minutí obou úrovní se počítají v instrumentation.metrics
+    (thumbnail_memory_hits/misses, thumbnail_disk_hits/misses, thumbnail_downloads).
+    """
+
+    def __init__(self, directory=THUMB_CACHE_DIR, memory_items=MEMORY_ITEMS, disk_bytes=DISK_BYTES):
+        self.memory = LRUCache(memory_items)
+        self.disk = DiskCache(directory, disk_bytes)
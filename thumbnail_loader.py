@@ -0,0 +1,147 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from PyQt5.QtCore import QObject, Qt, pyqtSignal
+from PyQt5.QtGui import QImage
+
+from instrumentation import count, error, timed
+
+# Počet vláken pro stahování a dekódování náhledů
+THUMBNAIL_WORKERS = 2
+
+# Přednačítání: vlastní pool, aby nebrzdilo náhled právě vybraného videa
+PREFETCH_WORKERS = 1
+PREFETCH_FIRST = 12       # počet prvních videí kanálu
+PREFETCH_NEIGHBOURS = 2   # počet sousedních řádků na každou stranu od výběru
+
+
+class ThumbnailError(Exception):
+    """Chyba stažení náhledu se zprávou určenou přímo pro zobrazení"""
+
+
+class ThumbnailLoader(QObject):
+    """Stahování a dekódování náhledů mimo GUI vlákno
+
+    Každý požadavek dostane číslo generace; starší požadavky se zruší nebo
+    zahodí, takže do GUI dorazí jen výsledek pro aktuálně vybrané video.
+    QImage lze na rozdíl od QPixmap vytvářet v pracovním vlákně.
+    """
+
+    # generace, (url, šířka, výška), QImage nebo None, chybová zpráva
+    loaded = pyqtSignal(int, object, object, str)
+    # generace přednačítání, (url, šířka, výška), QImage
+    prefetched = pyqtSignal(int, object, object)
+
+    def __init__(self, cache, download, max_workers=THUMBNAIL_WORKERS, prefetch_workers=PREFETCH_WORKERS):
+        super().__init__()
+        self.cache = cache
+        self.download = download  # funkce url -> bytes, při chybě vyhazuje výjimku
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="thumbnail")
+        self.prefetch_executor = ThreadPoolExecutor(max_workers=prefetch_workers, thread_name_prefix="prefetch")
+        self.generation = 0
+        self.future = None
+        self.prefetch_generation = 0
+        self.prefetch_futures = {}  # (url, šířka, výška) -> nedokončená future
+        self.closed = False  # po shutdown už pracovní vlákna nic neemitují
+        self.lock = threading.Lock()
+
+    def request(self, url, width, height):
+        """Naplánuje načtení náhledu a zruší předchozí požadavek"""
+        with self.lock:
+            self.generation += 1
+            generation = self.generation
+            if self.future is not None:
+                self.future.cancel()
+            self.future = self.executor.submit(self.load, generation, url, width, height)
+        return generation
+
+    def cancel(self):
+        with self.lock:
+            self.generation += 1
+            if self.future is not None:
+                self.future.cancel()
+                self.future = None
+
+    def is_current(self, generation):
+        return generation == self.generation
+
+    def read_image(self, url, width, height, is_current):
+        """Vrátí zmenšený QImage z diskové cache nebo ze sítě (None, pokud je požadavek zastaralý)"""
+        with timed("thumbnail_disk_read"):
+            data = self.cache.disk.get(url)
+        if data is None:
+            with timed("thumbnail_download"):
+                data = self.download(url)
+            count("thumbnail_downloads")
+            # Ukládá se i pro zastaralý požadavek, další výběr videa už stahovat nebude
+            with timed("thumbnail_disk_write"):
+                self.cache.disk.put(url, data)
+        if not is_current():
+            return None
+        with timed("thumbnail_decode"):
+            image = QImage.fromData(data)
+        if image.isNull():
+            self.cache.disk.discard(url)
+            raise ThumbnailError("Nelze načíst obrázek.")
+        with timed("thumbnail_scale"):
+            return image.scaled(width, height, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+
+    def load(self, generation, url, width, height):
+        key = (url, width, height)
+        if not self.is_current(generation):
+            return
+        try:
+            image = self.read_image(url, width, height, lambda: self.is_current(generation))
+            if image is not None and not self.closed:
+                self.loaded.emit(generation, key, image, "")
+        except ThumbnailError as e:
+            error("thumbnail", e)
+            if not self.closed:
+                self.loaded.emit(generation, key, None, str(e))
+        except Exception as e:
+            error("thumbnail", e)
+            if not self.closed:
+                self.loaded.emit(generation, key, None, f"Chyba obrázku: {e}")
+
+    def prefetch(self, keys):
+        """Naplánuje přednačtení náhledů (url, šířka, výška) s nízkou prioritou"""
+        with self.lock:
+            generation = self.prefetch_generation
+            # Drží se jen nedokončené; náhled vytlačený z paměti se tak dá přednačíst znovu
+            self.prefetch_futures = {key: future for key, future in self.prefetch_futures.items() if not future.done()}
+            for key in keys:
+                if key not in self.prefetch_futures:
+                    self.prefetch_futures[key] = self.prefetch_executor.submit(self.prefetch_one, generation, key)
+
+    def cancel_prefetch(self):
+        """Zastaví přednačítání (např. při změně kanálu)"""
+        with self.lock:
+            self.prefetch_generation += 1
+            for future in self.prefetch_futures.values():
+                future.cancel()
+            self.prefetch_futures = {}
+
+    def prefetch_one(self, generation, key):
+        def is_current():
+            return generation == self.prefetch_generation
+
+        if not is_current():
+            return
+        try:
+            image = self.read_image(*key, is_current)
+        except Exception as e:
+            error("thumbnail_prefetch", e)
+            return  # v GUI se chyba projeví až při skutečném výběru videa
+        if image is not None and not self.closed:
+            self.prefetched.emit(generation, key, image)
+
+    def shutdown(self):
+        """Zruší čekající požadavky a počká na rozběhnuté (stažení má omezený timeout)
+
+        Volat před zrušením okna a QApplication; po návratu už žádný signál nepřijde.
+        """
+        self.closed = True
+        self.cancel()
+        self.cancel_prefetch()
+        self.executor.shutdown(wait=True, cancel_futures=True)
+        self.prefetch_executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,55 @@
+import heapq
+from bisect import bisect_left, bisect_right
+
+# Název virtuální položky v seznamu kanálů
+ALL_CHANNELS = "Všechny kanály"
+
+
+def sort_key(video):
+    """Řazení od nejnovějšího videa"""
+    return -(video.published_ts or 0.0)
+
+
+class Timeline:
+    """Sloučená časová osa videí všech kanálů, seřazená od nejnovějšího
+
+    Celý seznam se sestaví k-cestným slučováním (heapq.merge) již seřazených
+    feedů. Obnova jednoho kanálu pak jen odebere jeho stará videa a vloží
+    nová půlením intervalu, bez přeřazení celého seznamu.
+    """
+
+    def __init__(self):
+        self.keys = []      # sort_key jednotlivých videí (vzestupně)
+        self.videos = []    # Video ve stejném pořadí
+        self.names = []     # název kanálu ke každému videu
+
+    def __len__(self):
+        return len(self.videos)
+
+    def build(self, channels):
+        """Sestaví osu ze slovníku název kanálu -> seznam videí"""
+        streams = [
+            [(sort_key(video), name, video) for video in sorted(entries, key=sort_key)]
+            for name, entries in channels.items()
+        ]
+        merged = list(heapq.merge(*streams, key=lambda item: item[0]))
+        self.keys = [item[0] for item in merged]
+        self.names = [item[1] for item in merged]
+        self.videos = [item[2] for item in merged]
+
+    def update_channel(self, name, old_entries, new_entries):
+        """Nahradí videa kanálu (old_entries -> new_entries) bez přeřazení celé osy"""
+        for video in old_entries:
+            key = sort_key(video)
+            index = bisect_left(self.keys, key)
+            while index < len(self.keys) and self.keys[index] == key:
+                if self.videos[index] is video:
+                    del self.keys[index], self.videos[index], self.names[index]
+                    break
+                index += 1
+        for video in new_entries:
+            key = sort_key(video)
+            index = bisect_right(self.keys, key)
+            self.keys.insert(index, key)
+            self.videos.insert(index, video)
+            self.names.insert(index, name)
@@ -0,0 +1,66 @@
+import calendar
+import re
+from datetime import datetime, timezone
+
+
+def published_timestamp(entry):
+    """Čas zveřejnění záznamu feedparseru jako unix timestamp (0, pokud chybí)"""
+    parsed = entry.get("published_parsed")
+    if parsed:
+        return float(calendar.timegm(parsed))
+    try:
+        published = datetime.fromisoformat(entry.get("published", ""))
+    except (TypeError, ValueError):
+        return 0.0
+    if published.tzinfo is None:
+        published = published.replace(tzinfo=timezone.utc)
+    return published.timestamp()
+
+
+def entry_video_id(entry):
+    """Vrátí yt:videoId záznamu (případně odvozené z odkazu)"""
+    video_id = entry.get("yt_videoid")
+    if video_id:
+        return video_id
+    link = entry.get("link", "")
+    match = re.search(r'v=([\w-]+)', link) or re.search(r'(?:/videos/|/embed/|/shorts/)([a-zA-Z0-9_-]+)', link)
+    return match.group(1) if match else entry.get("id", link)
+
+
+def entry_thumbnail(entry):
+    if entry.get("media_thumbnail"):
+        return entry["media_thumbnail"][0]["url"]
+    if entry.get("media_content"):
+        return entry["media_content"][0]["url"]
+    return None
+
+
+class Video:
+    """Kompaktní záznam videa; nahrazuje celý záznam feedparseru"""
+
+    __slots__ = ("video_id", "title", "published", "published_ts", "summary", "link", "thumbnail")
+
+    def __init__(self, video_id, title, published, published_ts, summary, link, thumbnail):
+        self.video_id = video_id
+        self.title = title
+        self.published = published
+        self.published_ts = published_ts
+        self.summary = summary
+        self.link = link
+        self.thumbnail = thumbnail
+
+    @classmethod
+    def from_entry(cls, entry):
+        """Vytvoří záznam ze záznamu feedparseru (jen čtená pole)"""
+        return cls(
+            entry_video_id(entry),
+            entry.get("title", ""),
+            entry.get("published", ""),
+            published_timestamp(entry),
+            entry.get("summary", ""),
+            entry.get("link", ""),
+            entry_thumbnail(entry),
+        )
+
+    def __repr__(self):
+        return f"Video({self.video_id!r}, {self.title!r})"
@@ -0,0 +1,70 @@
+"""Stav zhlédnutí videí a počty nezhlédnutých videí po kanálech
+
+Zhlédnutá videa jsou množina videoId načtená z EntryStore; dotaz na
+jedno video je vyhledání v množině. Počty nezhlédnutých videí se drží
+po kanálech (jen aktuální feedy, bez archivu) a mění se přírůstkově:
+nový feed kanálu přepočítá jen tento kanál, zhlédnutí videa sníží jeho
+kanál o jedna. Celkový součet pro "Všechny kanály" se mění stejně.
+"""
+import threading
+import time
+
+
+class WatchState:
+    """Zhlédnutá videa podle videoId s trvalým uložením v EntryStore"""
+
+    def __init__(self, store):
+        self.store = store
+        self.watched = set()  # videoId
+        self.unread = {}      # název kanálu -> počet nezhlédnutých videí
+        self.total = 0
+        self.lock = threading.Lock()
+
+    def load(self):
+        watched = self.store.load_watched()
+        with self.lock:
+            self.watched = watched
+
+    def is_watched(self, video_id):
+        return video_id in self.watched
+
+    def count(self, entries):
+        return sum(1 for video in entries if video.video_id not in self.watched)
+
+    def set_channel(self, channel_name, entries):
+        """Přepočet kanálu po novém feedu; vrací nový počet nezhlédnutých"""
+        with self.lock:
+            unread = self.count(entries)
+            self.total += unread - self.unread.get(channel_name, 0)
+            self.unread[channel_name] = unread
+        return unread
+
+    def remove_channel(self, channel_name):
+        with self.lock:
+            self.total -= self.unread.pop(channel_name, 0)
+
+    def mark(self, channel_name, video, entries):
+        """Označí video jako zhlédnuté; vrací True, pokud dosud zhlédnuté nebylo
+
+        entries jsou videa aktuálního feedu kanálu; je-li mezi nimi,
+        počet nezhlédnutých kanálu se sníží.
+        """
+        with self.lock:
+            if video.video_id in self.watched:
+                return False
+            self.watched.add(video.video_id)
+            if channel_name in self.unread and any(entry.video_id == video.video_id for entry in entries):
+                self.unread[channel_name] -= 1
+                self.total -= 1
+        try:
+            self.store.save_watched(video.video_id, time.time())
+        except Exception as e:
+            print(f"Chyba při ukládání stavu zhlédnutí: {e}")
+        return True
+
+    def next_unread(self, videos, start=0):
+        """Index prvního nezhlédnutého videa od start, -1 pokud žádné není"""
+        for index in range(max(start, 0), len(videos)):
+            if videos[index].video_id not in self.watched:
+                return index
+        return -1